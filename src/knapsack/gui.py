@@ -21,6 +21,9 @@ class KnapsackGUI(QMainWindow):
         self.encrypted_data = None
         self.encryption_details = None
         self.decryption_details = None
+        # Исходные данные для ленивого построения деталей визуализации
+        self.encryption_source = None
+        self.decryption_source = None
         
         # Создаем центральный виджет и основной макет
         central_widget = QWidget()
@@ -45,6 +48,9 @@ class KnapsackGUI(QMainWindow):
         self.about_tab = QWidget()
         self.tabs.addTab(self.about_tab, "О программе")
         self.setup_about_tab()
+        
+        # Детали шифрования/дешифрования строятся только при открытии вкладки визуализации
+        self.tabs.currentChanged.connect(self.on_tab_changed)
     
     def setup_encryption_tab(self):
         layout = QVBoxLayout(self.encryption_tab)
@@ -261,7 +267,12 @@ class KnapsackGUI(QMainWindow):
             return
         
         try:
-            self.encrypted_data, self.encryption_details = knapsack.encrypt_message(message, self.public_key)
+            self.encrypted_data, _ = knapsack.encrypt_message(message, self.public_key, details=False)
+            
+            # Детали шифрования будут построены при открытии вкладки визуализации
+            self.encryption_source = (message, self.public_key)
+            self.encryption_details = None
+            self.encryption_table.setRowCount(0)
             
             # Отображаем зашифрованное сообщение
             self.encrypted_display.setText(str(self.encrypted_data))
@@ -269,11 +280,8 @@ class KnapsackGUI(QMainWindow):
             # Очищаем поле с дешифрованным сообщением
             self.decrypted_display.clear()
             
-            # Обновляем таблицу визуализации шифрования
-            self.update_encryption_visualization()
-            
-            # Переключаемся на вкладку визуализации
-            self.tabs.setCurrentIndex(1)
+            # Детали строятся, только когда открыта вкладка визуализации
+            self.refresh_visible_visualization()
         except Exception as e:
             self.show_error(f"Ошибка при шифровании: {str(e)}")
     
@@ -287,21 +295,47 @@ class KnapsackGUI(QMainWindow):
             return
         
         try:
-            decrypted_message, self.decryption_details = knapsack.decrypt_message(
-                self.encrypted_data, self.private_key, self.n, self.m
+            decrypted_message, _ = knapsack.decrypt_message(
+                self.encrypted_data, self.private_key, self.n, self.m, details=False
             )
             
+            # Детали дешифрования будут построены при открытии вкладки визуализации
+            self.decryption_source = (self.encrypted_data, self.private_key, self.n, self.m)
+            self.decryption_details = None
+            self.decryption_table.setRowCount(0)
+            
             # Отображаем дешифрованное сообщение
             self.decrypted_display.setText(decrypted_message)
             
-            # Обновляем таблицу визуализации дешифрования
-            self.update_decryption_visualization()
-            
-            # Переключаемся на вкладку визуализации
-            self.tabs.setCurrentIndex(1)
+            # Детали строятся, только когда открыта вкладка визуализации
+            self.refresh_visible_visualization()
         except Exception as e:
             self.show_error(f"Ошибка при дешифровании: {str(e)}")
     
+    def refresh_visible_visualization(self):
+        """Обновляет таблицы, если вкладка визуализации уже открыта (иначе - при ее открытии)"""
+        if self.tabs.currentIndex() == 1:
+            self.refresh_visualization()
+    
+    def on_tab_changed(self, index):
+        if index == 1:
+            self.refresh_visualization()
+    
+    def refresh_visualization(self):
+        """Строит недостающие детали шифрования/дешифрования и заполняет таблицы"""
+        try:
+            if self.encryption_details is None and self.encryption_source is not None:
+                message, public_key = self.encryption_source
+                self.encryption_details = list(knapsack.iter_encryption_details(message, public_key))
+                self.update_encryption_visualization()
+            
+            if self.decryption_details is None and self.decryption_source is not None:
+                encrypted_data, private_key, n, m = self.decryption_source
+                self.decryption_details = list(knapsack.iter_decryption_details(encrypted_data, private_key, n, m))
+                self.update_decryption_visualization()
+        except Exception as e:
+            self.show_error(f"Ошибка при построении визуализации: {str(e)}")
+    
     def update_encryption_visualization(self):
         if not self.encryption_details:
             return
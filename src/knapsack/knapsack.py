@@ -1,4 +1,14 @@
+import hashlib
+import math
+import os
+import queue
 import random
+import struct
+import sys
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
 
 # Алгоритм шифрования рюкзака - асимметричный криптографический алгоритм,
 # основанный на задаче об укладке рюкзака (NP-полная задача).
@@ -32,11 +42,14 @@ def private_key_gen(letter_count):
     private_key = []
     # Начинаем с числа 1 или 2
     private_key.append(gen_rand(1, 2))
+    # Сумму предыдущих элементов ведем нарастающим итогом, а не пересчитываем
+    total = private_key[0]
     # Генерируем остальные элементы, обеспечивая суперрастущую последовательность
     for _ in range(letter_count - 1):
         # Каждый следующий элемент больше суммы всех предыдущих элементов на случайное число
-        new_value = sum(private_key) + gen_rand(3, 4)
+        new_value = total + gen_rand(3, 4)
         private_key.append(new_value)
+        total += new_value
     return private_key
 
 def public_key_gen(n, m, private_key):
@@ -54,46 +67,196 @@ def public_key_gen(n, m, private_key):
     # Для каждого элемента закрытого ключа выполняем умножение на n по модулю m
     return [(x * n) % m for x in private_key]
 
-def encrypt_message(message, public_key):
+def encryption_step_details(char, public_key):
+    """
+    Собирает детали шифрования одного символа (для визуализации).
+    
+    Аргументы:
+        char (str): Символ сообщения
+        public_key (list): Открытый ключ для шифрования
+        
+    Возвращает:
+        dict: Детали шифрования символа
+    """
+    # Преобразуем символ в битовое представление длины ключа (8 бит для обычного ключа)
+    bits = code_bits(ord(char), len(public_key))
+    step_details = {
+        'char': char,
+        'ascii': ord(char),
+        'bits': bits,
+        'used_keys': [],
+        'sum': 0
+    }
+    
+    # Для каждого бита, если он равен 1, добавляем соответствующий элемент открытого ключа
+    for idx, bit in enumerate(bits):
+        if bit == '1':
+            step_details['used_keys'].append((idx, public_key[idx]))
+            step_details['sum'] += public_key[idx]
+    
+    step_details['result'] = step_details['sum']
+    return step_details
+
+def iter_encryption_details(message, public_key):
+    """
+    Лениво выдает детали шифрования каждого символа сообщения.
+    
+    Аргументы:
+        message (str): Исходное текстовое сообщение
+        public_key (list): Открытый ключ для шифрования
+        
+    Возвращает:
+        generator: Детали шифрования символов (dict) по одному
+    """
+    for char in message:
+        yield encryption_step_details(char, public_key)
+
+def encrypt_message(message, public_key, details=True):
     """
     Шифрует сообщение с помощью открытого ключа.
     
     Аргументы:
         message (str): Исходное текстовое сообщение
         public_key (list): Открытый ключ для шифрования
+        details (bool): Собирать ли детали шифрования. При False детали
+            не создаются (вместо списка возвращается None), а шифрование
+            выполняется по таблице KnapsackEncryptor; детали можно получить
+            позже через iter_encryption_details()
         
     Возвращает:
         tuple: (Список зашифрованных значений, список деталей шифрования)
     """
-    res = []
-    encryption_details = []  # Для хранения деталей шифрования каждого символа
-    
-    for char in message:
-        # Преобразуем символ в 8-битное представление
-        bits = format(ord(char), '08b')
-        encrypt_char = 0
-        step_details = {
-            'char': char,
-            'ascii': ord(char),
-            'bits': bits,
-            'used_keys': [],
-            'sum': 0
-        }
-        
-        # Для каждого бита, если он равен 1, добавляем соответствующий элемент открытого ключа
-        for idx, bit in enumerate(bits):
-            if bit == '1':
-                encrypt_char += public_key[idx]
-                step_details['used_keys'].append((idx, public_key[idx]))
-                step_details['sum'] += public_key[idx]
-        
-        step_details['result'] = encrypt_char
-        encryption_details.append(step_details)
-        # Добавляем зашифрованное значение в результат
-        res.append(encrypt_char)
+    if not details:
+        return KnapsackEncryptor(public_key).encrypt(message), None
     
+    # Для хранения деталей шифрования каждого символа
+    encryption_details = list(iter_encryption_details(message, public_key))
+    res = [step_details['result'] for step_details in encryption_details]
     return res, encryption_details
 
+def code_bits(code, width):
+    """
+    Преобразует код символа (или блока) в строку из width битов.
+    
+    Аргументы:
+        code (int): Код символа или блока
+        width (int): Количество битов (длина ключа)
+        
+    Возвращает:
+        str: Битовое представление кода
+        
+    Исключения:
+        ValueError: Если код не помещается в width битов
+    """
+    if code < 0 or code >> width:
+        raise ValueError(f'Код {code} не помещается в {width} бит ключа')
+    return format(code, f'0{width}b')
+
+def subset_sum(code, public_key):
+    """
+    Вычисляет зашифрованное значение одного символа (или блока) по его коду.
+    
+    Код представляется len(public_key) битами (8 для обычного ключа), и для
+    каждого единичного бита суммируется соответствующий элемент открытого
+    ключа (как в encrypt_message).
+    
+    Аргументы:
+        code (int): Код символа или блока
+        public_key (list): Открытый ключ для шифрования
+        
+    Возвращает:
+        int: Зашифрованное значение
+    """
+    bits = code_bits(code, len(public_key))
+    return sum(public_key[idx] for idx, bit in enumerate(bits) if bit == '1')
+
+def _block_size(key):
+    """Количество байтов в блоке для ключа; длина ключа должна быть кратна 8."""
+    if not key or len(key) % 8:
+        raise ValueError('Для блочного режима длина ключа должна быть кратна 8')
+    return len(key) // 8
+
+class KnapsackEncryptor:
+    """
+    Шифратор с заранее вычисленными таблицами зашифрованных значений.
+    
+    Для 8-битного кода символа существует всего 256 возможных сумм элементов
+    открытого ключа, поэтому таблица строится один раз для ключа, а шифрование
+    сводится к одному обращению к таблице на символ (байт).
+    
+    Для блочного режима (ключ из 8 * k элементов, k байтов в блоке) строится
+    по таблице на каждый байт блока: значение блока - сумма k обращений к таблицам.
+    """
+    
+    def __init__(self, public_key):
+        """Строит таблицы зашифрованных значений"""
+        self.public_key = list(public_key)
+        # Коды, которые помещаются в длину ключа (для ключа короче 8 - меньше 256)
+        codes = range(min(256, 1 << len(self.public_key)))
+        self.table = [subset_sum(code, self.public_key) for code in codes]
+        # Таблицы для блочного режима строятся по требованию
+        self.byte_tables = None
+    
+    def encrypt(self, message):
+        """
+        Шифрует текстовое сообщение.
+        
+        Аргументы:
+            message (str): Исходное текстовое сообщение
+            
+        Возвращает:
+            list: Список зашифрованных значений (как в encrypt_message)
+        """
+        try:
+            data = message.encode('latin-1')
+        except UnicodeEncodeError:
+            # Символы с кодом больше 255 в таблицу не попадают
+            return [subset_sum(ord(char), self.public_key) for char in message]
+        return self.encrypt_bytes(data)
+    
+    def encrypt_bytes(self, data):
+        """
+        Шифрует двоичные данные: каждый байт шифруется как символ с тем же кодом.
+        
+        Аргументы:
+            data (bytes-like): Исходные данные
+            
+        Возвращает:
+            list: Список зашифрованных значений
+        """
+        data = memoryview(data).cast('B')
+        if len(self.table) < 256:
+            return [subset_sum(code, self.public_key) for code in data]
+        return list(map(self.table.__getitem__, data))
+    
+    def encrypt_blocks(self, data):
+        """
+        Шифрует двоичные данные блоками по len(public_key) // 8 байтов.
+        
+        Байты блока образуют одно число (старший байт первым), которое
+        шифруется как код длины ключа. Последний неполный блок дополняется нулями.
+        
+        Аргументы:
+            data (bytes-like): Исходные данные
+            
+        Возвращает:
+            list: Список зашифрованных значений блоков
+        """
+        k = _block_size(self.public_key)
+        if self.byte_tables is None:
+            self.byte_tables = [
+                [subset_sum(code, self.public_key[8 * j:8 * j + 8]) for code in range(256)]
+                for j in range(k)
+            ]
+        data = bytes(memoryview(data).cast('B'))
+        if len(data) % k:
+            data += bytes(k - len(data) % k)
+        tables = self.byte_tables
+        return [
+            sum(tables[j][data[pos + j]] for j in range(k))
+            for pos in range(0, len(data), k)
+        ]
+
 def extended_gcd(a, b):
     """
     Вычисляет наибольший общий делитель и коэффициенты Безу с помощью расширенного алгоритма Евклида.
@@ -106,12 +269,18 @@ def extended_gcd(a, b):
     Возвращает:
         tuple: (НОД, x, y) - наибольший общий делитель и коэффициенты Безу
     """
-    if a == 0:
-        return b, 0, 1
-    else:
-        gcd, x, y = extended_gcd(b % a, a)
-        # Обратный расчет коэффициентов
-        return gcd, y - (b // a) * x, x
+    # Прямой ход алгоритма Евклида: запоминаем частные вместо рекурсивных вызовов,
+    # чтобы не упираться в предел глубины рекурсии на больших ключах
+    quotients = []
+    while a != 0:
+        quotients.append(b // a)
+        a, b = b % a, a
+    
+    # Обратный расчет коэффициентов
+    x, y = 0, 1
+    for q in reversed(quotients):
+        x, y = y - q * x, x
+    return b, x, y
 
 def mod_inverse(a, m):
     """
@@ -128,15 +297,78 @@ def mod_inverse(a, m):
     Исключения:
         Exception: Если модульное обратное не существует (НОД(a,m) != 1)
     """
-    gcd, x, y = extended_gcd(a, m)
-    if gcd != 1:
-        raise Exception('Модульное обратное не существует')
-    else:
-        return x % m
+    try:
+        return pow(a, -1, m)
+    except ValueError:
+        raise Exception('Модульное обратное не существует') from None
 
-def decrypt_message(encrypted_values, private_key, n, m):
+def coprime_gen(m):
     """
-    Расшифровывает зашифрованные значения с использованием закрытого ключа и параметров n и m.
+    Выбирает случайное число n из [2, m - 1], взаимно простое с m.
+    
+    Кандидаты выбираются равномерно и отбрасываются, пока не найдется
+    взаимно простой с m, поэтому n распределено равномерно среди подходящих
+    чисел. Среднее число попыток - около m / phi(m); эта величина растет
+    как log log m и остается небольшой константой.
+    
+    Аргументы:
+        m (int): Модуль (m > 2)
+        
+    Возвращает:
+        int: Множитель n, взаимно простой с m
+    """
+    while True:
+        n = gen_rand(2, m - 1)
+        if math.gcd(n, m) == 1:
+            return n
+
+def decryption_step_details(value, private_key, n_inverse, m):
+    """
+    Собирает детали дешифрования одного значения (для визуализации).
+    
+    Аргументы:
+        value (int): Зашифрованное значение
+        private_key (list): Закрытый ключ - суперрастущая последовательность
+        n_inverse (int): Обратный элемент к n по модулю m
+        m (int): Модуль, использованный при генерации открытого ключа
+        
+    Возвращает:
+        dict: Детали дешифрования значения
+    """
+    step_details = {
+        'encrypted_value': value,
+        'n_inverse': n_inverse,
+        'm': m
+    }
+    
+    # Преобразуем в домен закрытого ключа, умножая на обратный элемент
+    s_prime = (value * n_inverse) % m
+    step_details['s_prime'] = s_prime
+    
+    # Находим биты, используя суперрастущее свойство закрытого ключа
+    # Используем жадный алгоритм, начиная с самых больших элементов
+    bits = ['0'] * len(private_key)
+    remaining = s_prime
+    used_private_keys = []
+    
+    for i in range(len(private_key) - 1, -1, -1):
+        if remaining >= private_key[i]:
+            bits[i] = '1'
+            remaining -= private_key[i]
+            used_private_keys.append((i, private_key[i]))
+    
+    step_details['bits'] = ''.join(bits)
+    step_details['used_private_keys'] = used_private_keys
+    
+    # Преобразуем биты в символ
+    char_code = int(''.join(bits), 2)
+    step_details['char_code'] = char_code
+    step_details['char'] = chr(char_code)
+    return step_details
+
+def iter_decryption_details(encrypted_values, private_key, n, m):
+    """
+    Лениво выдает детали дешифрования каждого зашифрованного значения.
     
     Аргументы:
         encrypted_values (list): Список зашифрованных значений
@@ -145,53 +377,480 @@ def decrypt_message(encrypted_values, private_key, n, m):
         m (int): Модуль, использованный при генерации открытого ключа
         
     Возвращает:
-        tuple: (Расшифрованное сообщение, список деталей дешифрования)
+        generator: Детали дешифрования значений (dict) по одному
     """
     # Находим обратный элемент к n по модулю m
     n_inverse = mod_inverse(n, m)
-    decrypted_message = ""
-    decryption_details = []  # Для хранения деталей дешифрования
-    
     for value in encrypted_values:
-        step_details = {
-            'encrypted_value': value,
-            'n_inverse': n_inverse,
-            'm': m
-        }
-        
-        # Преобразуем в домен закрытого ключа, умножая на обратный элемент
-        s_prime = (value * n_inverse) % m
-        step_details['s_prime'] = s_prime
-        
-        # Находим биты, используя суперрастущее свойство закрытого ключа
-        # Используем жадный алгоритм, начиная с самых больших элементов
-        bits = ['0'] * len(private_key)
-        remaining = s_prime
-        used_private_keys = []
-        
-        for i in range(len(private_key) - 1, -1, -1):
-            if remaining >= private_key[i]:
-                bits[i] = '1'
-                remaining -= private_key[i]
-                used_private_keys.append((i, private_key[i]))
-        
-        step_details['bits'] = ''.join(bits)
-        step_details['used_private_keys'] = used_private_keys
-        
-        # Преобразуем биты в символ и добавляем в результат
-        char_code = int(''.join(bits), 2)
-        step_details['char_code'] = char_code
-        step_details['char'] = chr(char_code)
-        
-        decrypted_message += chr(char_code)
-        decryption_details.append(step_details)
+        yield decryption_step_details(value, private_key, n_inverse, m)
+
+def decrypt_message(encrypted_values, private_key, n, m, details=True):
+    """
+    Расшифровывает зашифрованные значения с использованием закрытого ключа и параметров n и m.
+    
+    Аргументы:
+        encrypted_values (list | bytes-like): Список зашифрованных значений
+            или упакованный шифротекст (pack_ciphertext)
+        private_key (list): Закрытый ключ - суперрастущая последовательность
+        n (int): Множитель, использованный при генерации открытого ключа
+        m (int): Модуль, использованный при генерации открытого ключа
+        details (bool): Собирать ли детали дешифрования. При False детали
+            не создаются (вместо списка возвращается None), а дешифрование
+            выполняется через KnapsackDecryptor; детали можно получить
+            позже через iter_decryption_details()
         
+    Возвращает:
+        tuple: (Расшифрованное сообщение, список деталей дешифрования)
+    """
+    if is_packed(encrypted_values):
+        encrypted_values = unpack_for_key(encrypted_values, private_key, n, m, MODE_CHARS).values
+    
+    if not details:
+        return KnapsackDecryptor(private_key, n, m).decrypt(encrypted_values), None
+    
+    # Для хранения деталей дешифрования
+    decryption_details = list(iter_decryption_details(encrypted_values, private_key, n, m))
+    decrypted_message = ''.join([step_details['char'] for step_details in decryption_details])
     return decrypted_message, decryption_details
 
+def superincreasing_decode(s_prime, private_key):
+    """
+    Восстанавливает код символа по значению s' жадным алгоритмом.
+    
+    Использует суперрастущее свойство закрытого ключа, начиная с самых
+    больших элементов (как в decrypt_message).
+    
+    Аргументы:
+        s_prime (int): Значение в домене закрытого ключа
+        private_key (list): Закрытый ключ - суперрастущая последовательность
+        
+    Возвращает:
+        int: Код символа
+    """
+    code = 0
+    remaining = s_prime
+    last = len(private_key) - 1
+    for i in range(last, -1, -1):
+        if remaining >= private_key[i]:
+            remaining -= private_key[i]
+            code |= 1 << (last - i)
+    return code
+
+class KnapsackDecryptor:
+    """
+    Дешифратор с заранее вычисленными данными для ключа (private_key, n, m).
+    
+    Обратный элемент n по модулю m находится один раз, а все допустимые
+    зашифрованные значения однобайтовых кодов заранее отображаются в символы,
+    поэтому дешифрование сводится к одному обращению к словарю на значение.
+    Прочие значения дешифруются обычным способом.
+    """
+    
+    def __init__(self, private_key, n, m):
+        """Вычисляет n⁻¹ и таблицу зашифрованное значение -> символ"""
+        self.private_key = list(private_key)
+        self.n = n
+        self.m = m
+        self.n_inverse = mod_inverse(n, m)
+        public_key = public_key_gen(n, m, self.private_key)
+        self.table = {}
+        for code in range(min(256, 1 << len(self.private_key))):
+            value = subset_sum(code, public_key)
+            self.table[value] = self.decrypt_value(value)
+    
+    def decrypt_code(self, value):
+        """Восстанавливает код символа (или блока) по зашифрованному значению"""
+        s_prime = (value * self.n_inverse) % self.m
+        return superincreasing_decode(s_prime, self.private_key)
+    
+    def decrypt_value(self, value):
+        """Дешифрует одно значение без обращения к таблице"""
+        return chr(self.decrypt_code(value))
+    
+    def decrypt(self, encrypted_values):
+        """
+        Расшифровывает список зашифрованных значений.
+        
+        Аргументы:
+            encrypted_values (iterable): Зашифрованные значения
+            
+        Возвращает:
+            str: Расшифрованное сообщение (как в decrypt_message)
+        """
+        table = self.table
+        return ''.join([table.get(value) or self.decrypt_value(value) for value in encrypted_values])
+    
+    def decrypt_blocks(self, encrypted_values, length=None):
+        """
+        Расшифровывает значения, полученные в блочном режиме (encrypt_blocks).
+        
+        Аргументы:
+            encrypted_values (iterable): Зашифрованные значения блоков
+            length (int, optional): Исходная длина данных в байтах (для отбрасывания дополнения)
+            
+        Возвращает:
+            bytes: Расшифрованные данные
+        """
+        k = _block_size(self.private_key)
+        data = b''.join([self.decrypt_code(value).to_bytes(k, 'big') for value in encrypted_values])
+        return data if length is None else data[:length]
+
+def encrypt_blocks(data, public_key):
+    """
+    Шифрует двоичные данные в блочном режиме (len(public_key) // 8 байтов на значение).
+    
+    Аргументы:
+        data (bytes-like): Исходные данные
+        public_key (list): Открытый ключ длины, кратной 8 (например, generate_keys(256))
+        
+    Возвращает:
+        list: Список зашифрованных значений блоков
+    """
+    return KnapsackEncryptor(public_key).encrypt_blocks(data)
+
+def decrypt_blocks(encrypted_values, private_key, n, m, length=None):
+    """
+    Расшифровывает данные, зашифрованные в блочном режиме.
+    
+    Аргументы:
+        encrypted_values (list | bytes-like): Список зашифрованных значений блоков
+            или упакованный шифротекст (pack_ciphertext)
+        private_key (list): Закрытый ключ - суперрастущая последовательность
+        n (int): Множитель, использованный при генерации открытого ключа
+        m (int): Модуль, использованный при генерации открытого ключа
+        length (int, optional): Исходная длина данных в байтах
+            (для упакованного шифротекста берется из заголовка)
+        
+    Возвращает:
+        bytes: Расшифрованные данные
+    """
+    if is_packed(encrypted_values):
+        packed = unpack_for_key(encrypted_values, private_key, n, m, MODE_BLOCKS)
+        encrypted_values = packed.values
+        if length is None:
+            length = packed.length
+    return KnapsackDecryptor(private_key, n, m).decrypt_blocks(encrypted_values, length)
+
+# Упакованный формат шифротекста:
+#   заголовок (24 байта, little-endian): сигнатура, версия, режим, ширина значения,
+#   резервный байт, отпечаток открытого ключа (8 байтов), длина (8 байтов);
+#   далее значения фиксированной ширины в little-endian.
+# Длина - количество значений в символьном режиме и исходная длина данных
+# в байтах в блочном режиме.
+CIPHERTEXT_MAGIC = b'KNPS'
+CIPHERTEXT_VERSION = 1
+MODE_CHARS = 0
+MODE_BLOCKS = 1
+_HEADER = struct.Struct('<4sBBBx8sQ')
+# Форматы memoryview для ширин, которые читаются без копирования
+_WIDTH_FORMATS = {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}
+
+PackedCiphertext = namedtuple('PackedCiphertext', ['mode', 'width', 'fingerprint', 'length', 'values'])
+
+def key_fingerprint(public_key):
+    """
+    Вычисляет отпечаток открытого ключа (первые 8 байтов SHA-256).
+    
+    Аргументы:
+        public_key (list): Открытый ключ
+        
+    Возвращает:
+        bytes: Отпечаток ключа
+    """
+    return hashlib.sha256(','.join(map(str, public_key)).encode('ascii')).digest()[:8]
+
+def value_width(public_key):
+    """
+    Выбирает минимальную ширину (в байтах) для хранения зашифрованных значений.
+    
+    Зашифрованное значение - сумма элементов открытого ключа, поэтому оно
+    не превосходит sum(public_key) (и может быть больше m). Ширины до 8 байтов
+    округляются до 1, 2, 4 или 8, большие ключи хранятся в точной ширине.
+    
+    Аргументы:
+        public_key (list): Открытый ключ
+        
+    Возвращает:
+        int: Ширина значения в байтах
+    """
+    width = max(1, (sum(public_key).bit_length() + 7) // 8)
+    if width <= 8:
+        return next(size for size in sorted(_WIDTH_FORMATS) if size >= width)
+    return width
+
+def pack_ciphertext(encrypted_values, public_key, mode=MODE_CHARS, length=None):
+    """
+    Упаковывает зашифрованные значения в компактный двоичный контейнер.
+    
+    Аргументы:
+        encrypted_values (list): Зашифрованные значения
+        public_key (list): Открытый ключ, которым они получены
+        mode (int): MODE_CHARS (encrypt_message) или MODE_BLOCKS (encrypt_blocks)
+        length (int, optional): Исходная длина данных в байтах для блочного режима
+        
+    Возвращает:
+        bytes: Упакованный шифротекст
+    """
+    width = value_width(public_key)
+    if length is None:
+        length = len(encrypted_values)
+    header = _HEADER.pack(CIPHERTEXT_MAGIC, CIPHERTEXT_VERSION, mode, width,
+                          key_fingerprint(public_key), length)
+    return header + pack_values(encrypted_values, width)
+
+def pack_values(encrypted_values, width):
+    """
+    Упаковывает значения фиксированной ширины (без заголовка).
+    
+    Аргументы:
+        encrypted_values (list): Зашифрованные значения
+        width (int): Ширина значения в байтах (см. value_width)
+        
+    Возвращает:
+        bytes: Упакованные значения в little-endian
+    """
+    fmt = _WIDTH_FORMATS.get(width)
+    if fmt is not None:
+        return struct.pack(f'<{len(encrypted_values)}{fmt}', *encrypted_values)
+    return b''.join([value.to_bytes(width, 'little') for value in encrypted_values])
+
+def unpack_values(payload, width):
+    """
+    Распаковывает значения фиксированной ширины.
+    
+    Для ширин 1, 2, 4 и 8 байтов на little-endian платформе возвращается
+    memoryview поверх исходного буфера - без копирования данных.
+    
+    Аргументы:
+        payload (bytes-like): Упакованные значения
+        width (int): Ширина значения в байтах
+        
+    Возвращает:
+        memoryview | list: Последовательность зашифрованных значений
+    """
+    payload = memoryview(payload).cast('B')
+    if len(payload) % width:
+        raise ValueError('Длина данных не кратна ширине значения')
+    fmt = _WIDTH_FORMATS.get(width)
+    if fmt is not None and sys.byteorder == 'little':
+        return payload.cast(fmt)
+    return [int.from_bytes(payload[pos:pos + width], 'little') for pos in range(0, len(payload), width)]
+
+def is_packed(data):
+    """
+    Проверяет, является ли объект упакованным шифротекстом (байтовым буфером).
+    
+    memoryview с другим форматом (например, значения из unpack_values)
+    считается последовательностью зашифрованных значений.
+    """
+    if isinstance(data, (bytes, bytearray)):
+        return True
+    return isinstance(data, memoryview) and data.format == 'B'
+
+def unpack_ciphertext(data):
+    """
+    Разбирает упакованный шифротекст.
+    
+    Аргументы:
+        data (bytes-like): Упакованный шифротекст (pack_ciphertext)
+        
+    Возвращает:
+        PackedCiphertext: Режим, ширина, отпечаток ключа, длина и значения
+        
+    Исключения:
+        ValueError: Если данные не являются упакованным шифротекстом
+            или количество значений не совпадает с длиной в заголовке
+    """
+    data = memoryview(data).cast('B')
+    mode, width, fingerprint, length = _read_header(data)
+    values = unpack_values(data[_HEADER.size:], width)
+    # Нулевая длина записывается при потоковом шифровании в канал без перемещения
+    if mode == MODE_CHARS and length and length != len(values):
+        raise ValueError('Количество значений не совпадает с длиной в заголовке')
+    return PackedCiphertext(mode, width, fingerprint, length, values)
+
+def _read_header(data):
+    """Разбирает и проверяет заголовок упакованного шифротекста."""
+    if len(data) < _HEADER.size:
+        raise ValueError('Слишком короткий упакованный шифротекст')
+    magic, version, mode, width, fingerprint, length = _HEADER.unpack_from(data)
+    if magic != CIPHERTEXT_MAGIC or version != CIPHERTEXT_VERSION:
+        raise ValueError('Неизвестный формат упакованного шифротекста')
+    if mode not in (MODE_CHARS, MODE_BLOCKS):
+        raise ValueError('Неизвестный режим упакованного шифротекста')
+    if width == 0:
+        raise ValueError('Нулевая ширина значения в заголовке')
+    return mode, width, fingerprint, length
+
+def _check_key(fingerprint, mode, width, private_key, n, m, expected_mode):
+    """Проверяет, что шифротекст получен ключом (private_key, n, m) в ожидаемом режиме."""
+    public_key = public_key_gen(n, m, private_key)
+    if fingerprint != key_fingerprint(public_key):
+        raise ValueError('Шифротекст получен другим ключом')
+    if width != value_width(public_key):
+        raise ValueError('Ширина значения не соответствует ключу')
+    if mode != expected_mode:
+        raise ValueError('Режим шифротекста не совпадает (символьный/блочный)')
+
+def unpack_for_key(data, private_key, n, m, mode):
+    """
+    Разбирает упакованный шифротекст и проверяет, что он получен ключом (private_key, n, m).
+    
+    Исключения:
+        ValueError: Если отпечаток ключа или режим не совпадают
+            либо длина в заголовке не соответствует данным
+    """
+    packed = unpack_ciphertext(data)
+    _check_key(packed.fingerprint, packed.mode, packed.width, private_key, n, m, mode)
+    if mode == MODE_BLOCKS:
+        k = _block_size(private_key)
+        count = len(packed.values)
+        if packed.length > count * k or (count and packed.length <= (count - 1) * k):
+            raise ValueError('Длина данных в заголовке не соответствует количеству блоков')
+    return packed
+
+# Размер читаемой за раз части (в байтах) при потоковом шифровании
+STREAM_CHUNK_SIZE = 1 << 16
+# Смещение поля длины в заголовке упакованного шифротекста
+_HEADER_LENGTH_OFFSET = _HEADER.size - 8
+
+def iter_encrypt_stream(chunks, public_key):
+    """
+    Потоково шифрует двоичные данные, выдавая упакованный шифротекст частями.
+    
+    Каждый байт шифруется как символ с тем же кодом (символьный режим).
+    Первой выдается часть с заголовком; поле длины в нем равно 0,
+    так как длина потока заранее не известна.
+    
+    Аргументы:
+        chunks (iterable): Части исходных данных (bytes-like)
+        public_key (list): Открытый ключ для шифрования
+        
+    Возвращает:
+        generator: Части упакованного шифротекста (bytes)
+    """
+    encryptor = KnapsackEncryptor(public_key)
+    width = value_width(public_key)
+    yield _HEADER.pack(CIPHERTEXT_MAGIC, CIPHERTEXT_VERSION, MODE_CHARS, width,
+                       key_fingerprint(public_key), 0)
+    for chunk in chunks:
+        if len(chunk):
+            yield pack_values(encryptor.encrypt_bytes(chunk), width)
+
+def iter_decrypt_stream(chunks, private_key, n, m):
+    """
+    Потоково расшифровывает упакованный шифротекст, полученный iter_encrypt_stream().
+    
+    Части могут быть разбиты произвольно: неполный заголовок и неполные
+    значения накапливаются до прихода следующей части. Если в заголовке
+    записана длина (encrypt_stream в файл с перемещением), по окончании
+    потока она сверяется с количеством расшифрованных значений.
+    
+    Аргументы:
+        chunks (iterable): Части упакованного шифротекста (bytes-like)
+        private_key (list): Закрытый ключ - суперрастущая последовательность
+        n (int): Множитель, использованный при генерации открытого ключа
+        m (int): Модуль, использованный при генерации открытого ключа
+        
+    Возвращает:
+        generator: Части расшифрованных данных (bytes)
+        
+    Исключения:
+        ValueError: Если шифротекст поврежден, обрезан или получен другим ключом
+    """
+    decryptor = KnapsackDecryptor(private_key, n, m)
+    buffer = bytearray()
+    width = None
+    count = 0
+    for chunk in chunks:
+        buffer += chunk
+        if width is None:
+            if len(buffer) < _HEADER.size:
+                continue
+            mode, width, fingerprint, length = _read_header(buffer)
+            _check_key(fingerprint, mode, width, private_key, n, m, MODE_CHARS)
+            del buffer[:_HEADER.size]
+        usable = len(buffer) - len(buffer) % width
+        if usable:
+            values = unpack_values(bytes(buffer[:usable]), width)
+            del buffer[:usable]
+            count += len(values)
+            yield decryptor.decrypt(values).encode('latin-1')
+    if width is None:
+        raise ValueError('Слишком короткий упакованный шифротекст')
+    if buffer:
+        raise ValueError('Длина данных не кратна ширине значения')
+    if length and count != length:
+        raise ValueError('Количество значений не совпадает с длиной в заголовке')
+
+def _read_chunks(src, chunk_size):
+    """Читает двоичный файл (или канал) частями фиксированного размера."""
+    return iter(lambda: src.read(chunk_size), b'')
+
+def encrypt_stream(src, dst, public_key, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Шифрует двоичный файл (или канал) в упакованный шифротекст с постоянным расходом памяти.
+    
+    Если выходной файл поддерживает перемещение, по окончании в заголовок
+    записывается количество зашифрованных значений.
+    
+    Аргументы:
+        src (file): Исходный файл, открытый в двоичном режиме для чтения
+        dst (file): Выходной файл, открытый в двоичном режиме для записи
+        public_key (list): Открытый ключ для шифрования
+        chunk_size (int): Размер читаемой за раз части в байтах
+        
+    Возвращает:
+        int: Количество зашифрованных байтов
+    """
+    start = dst.tell() if dst.seekable() else None
+    total = 0
+    
+    def counted(chunks):
+        nonlocal total
+        for chunk in chunks:
+            total += len(chunk)
+            yield chunk
+    
+    for part in iter_encrypt_stream(counted(_read_chunks(src, chunk_size)), public_key):
+        dst.write(part)
+    
+    if start is not None:
+        end = dst.tell()
+        dst.seek(start + _HEADER_LENGTH_OFFSET)
+        dst.write(struct.pack('<Q', total))
+        dst.seek(end)
+    return total
+
+def decrypt_stream(src, dst, private_key, n, m, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Расшифровывает упакованный шифротекст из файла (или канала) с постоянным расходом памяти.
+    
+    Аргументы:
+        src (file): Файл с упакованным шифротекстом, открытый в двоичном режиме
+        dst (file): Выходной файл, открытый в двоичном режиме для записи
+        private_key (list): Закрытый ключ - суперрастущая последовательность
+        n (int): Множитель, использованный при генерации открытого ключа
+        m (int): Модуль, использованный при генерации открытого ключа
+        chunk_size (int): Размер читаемой за раз части в байтах
+        
+    Возвращает:
+        int: Количество расшифрованных байтов
+    """
+    total = 0
+    for part in iter_decrypt_stream(_read_chunks(src, chunk_size), private_key, n, m):
+        dst.write(part)
+        total += len(part)
+    return total
+
 def generate_keys(bit_length=8):
     """
     Генерирует ключи для алгоритма шифрования рюкзака.
     
+    Ключ длины 8 шифрует по одному символу на значение. Ключи длины 8 * k
+    (например, 64-256 бит) используются в блочном режиме (encrypt_blocks),
+    где одно значение содержит k байтов.
+    
     Аргументы:
         bit_length (int): Длина ключа в битах
         
@@ -203,15 +862,126 @@ def generate_keys(bit_length=8):
     
     # Выбираем n и m для трансформации ключа
     m = sum(private_key) + gen_rand(10, 100)
-    n = gen_rand(2, m - 1)
-    while extended_gcd(n, m)[0] != 1:
-        n = gen_rand(2, m - 1)
+    n = coprime_gen(m)
     
     # Генерируем открытый ключ
     public_key = public_key_gen(n, m, private_key)
     
     return private_key, public_key, n, m
 
+def private_keys_batch(count, letter_count):
+    """
+    Генерирует сразу несколько закрытых ключей (суперрастущих последовательностей).
+    
+    Случайные слагаемые ключа (1 или 2 для первого элемента, 3 или 4 для
+    остальных) берутся из одного вызова random.getrandbits() на ключ - по
+    одному биту на элемент, а сама последовательность строится через
+    accumulate: сумма после очередного элемента равна 2 * S + r.
+    
+    Аргументы:
+        count (int): Количество ключей
+        letter_count (int): Длина каждого ключа
+        
+    Возвращает:
+        list: Список закрытых ключей
+    """
+    keys = []
+    for _ in range(count):
+        bits = random.getrandbits(letter_count)
+        first = 1 + (bits & 1)
+        increments = [3 + ((bits >> i) & 1) for i in range(1, letter_count)]
+        # Нарастающие суммы элементов ключа
+        totals = list(accumulate(increments, lambda total, r: 2 * total + r, initial=first))
+        keys.append([first] + [b - a for a, b in zip(totals, totals[1:])])
+    return keys
+
+def _generate_keys_chunk(count, bit_length):
+    """Генерирует часть пакета ключей (выполняется в процессе пула)."""
+    result = []
+    for private_key in private_keys_batch(count, bit_length):
+        m = sum(private_key) + gen_rand(10, 100)
+        n = coprime_gen(m)
+        result.append((private_key, public_key_gen(n, m, private_key), n, m))
+    return result
+
+def _reseed_worker():
+    """
+    Заново инициализирует генератор случайных чисел в процессе пула.
+    
+    Иначе процессы, созданные через fork, унаследуют одно состояние random
+    и выдадут одинаковые ключи.
+    """
+    random.seed(os.urandom(32))
+
+def generate_keys_batch(count, bit_length=8, workers=None, chunk_size=256):
+    """
+    Генерирует пакет ключей для алгоритма шифрования рюкзака.
+    
+    Аргументы:
+        count (int): Количество пар ключей
+        bit_length (int): Длина ключа в битах
+        workers (int, optional): Количество процессов; None или 1 - в текущем процессе
+        chunk_size (int): Количество ключей в одном задании для процесса
+        
+    Возвращает:
+        list: Список кортежей (private_key, public_key, n, m)
+    """
+    if workers is None or workers <= 1 or count <= chunk_size:
+        return _generate_keys_chunk(count, bit_length)
+    
+    chunks = [min(chunk_size, count - start) for start in range(0, count, chunk_size)]
+    keys = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_reseed_worker) as pool:
+        for part in pool.map(_generate_keys_chunk, chunks, [bit_length] * len(chunks)):
+            keys.extend(part)
+    return keys
+
+class KeyPool:
+    """
+    Пул заранее сгенерированных ключей, пополняемый в фоновом потоке.
+    
+    get() выдает готовую пару ключей за O(1); если пул временно пуст,
+    ключи генерируются на месте, чтобы вызывающий код не ждал.
+    """
+    
+    def __init__(self, size=1024, bit_length=8, refill_batch=64):
+        """Создает пул и запускает фоновый поток пополнения"""
+        self.bit_length = bit_length
+        self.refill_batch = refill_batch
+        self.keys = queue.Queue(maxsize=size)
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._refill, daemon=True)
+        self.thread.start()
+    
+    def _refill(self):
+        while not self.stopped.is_set():
+            for keys in generate_keys_batch(self.refill_batch, self.bit_length):
+                # Ждем свободного места, периодически проверяя остановку пула
+                while not self.stopped.is_set():
+                    try:
+                        self.keys.put(keys, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+    
+    def get(self):
+        """Выдает пару ключей (private_key, public_key, n, m)"""
+        try:
+            return self.keys.get_nowait()
+        except queue.Empty:
+            return generate_keys(self.bit_length)
+    
+    def close(self):
+        """Останавливает фоновое пополнение пула"""
+        self.stopped.set()
+        self.thread.join()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
 def main():
     """
     Основная функция для демонстрации работы алгоритма шифрования рюкзака.
@@ -233,9 +1003,7 @@ def main():
     # m должно быть больше суммы всех элементов закрытого ключа
     m = sum(private_key) + gen_rand(10, 100)
     # n должно быть взаимно простым с m
-    n = gen_rand(2, m - 1)
-    while extended_gcd(n, m)[0] != 1:
-        n = gen_rand(2, m - 1)
+    n = coprime_gen(m)
         
     print(f"\nПараметры для трансформации ключа:")
     print(f"m = {m} (модуль, больше суммы закрытого ключа)")
@@ -276,9 +1044,7 @@ def main():
     # Генерируем новые ключи для этого сообщения
     private_key3 = private_key_gen(8)
     m3 = sum(private_key3) + gen_rand(10, 100)
-    n3 = gen_rand(2, m3 - 1)
-    while extended_gcd(n3, m3)[0] != 1:
-        n3 = gen_rand(2, m3 - 1)
+    n3 = coprime_gen(m3)
     
     public_key3 = public_key_gen(n3, m3, private_key3)
     
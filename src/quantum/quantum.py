@@ -1,13 +1,40 @@
+import csv
+import hashlib
+import json
+import os
 import random
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from statistics import NormalDist
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+
+import numpy as np
 
 class QuantumBB84:
     """Класс для симуляции протокола квантового распределения ключей BB84"""
     
-    def __init__(self, length=20):
-        """Инициализация с указанной длиной последовательности"""
+    def __init__(self, length=20, rng=None, seed=None):
+        """
+        Инициализация с указанной длиной последовательности.
+        
+        rng - источник случайности с методом getrandbits() (random.Random,
+        secrets.SystemRandom для настоящего ключевого материала и т.п.);
+        seed - начальное значение для воспроизводимого запуска.
+        По умолчанию используется глобальный модуль random.
+        """
         self.length = length
+        self.rng = self.make_rng(rng, seed)
         self.reset()
     
+    def make_rng(self, rng=None, seed=None):
+        """Создает источник случайности для симуляции"""
+        if rng is not None:
+            return rng
+        if seed is not None:
+            return random.Random(seed)
+        return random
+    
     def reset(self):
         """Сбрасывает все данные симуляции"""
         self.alice_bits = []
@@ -24,13 +51,20 @@ class QuantumBB84:
         self.error_rate = 0
         self.eavesdropping = False
     
+    def random_bits(self, length):
+        """Получает length случайных битов одним обращением к источнику случайности"""
+        if length <= 0:
+            return []
+        # Двоичная запись строится за линейное время; младший бит - первый
+        return list(map(int, format(self.rng.getrandbits(length), f'0{length}b')[::-1]))
+    
     def generate_random_bits(self, length):
         """Генерирует случайную последовательность битов заданной длины"""
-        return [random.randint(0, 1) for _ in range(length)]
+        return self.random_bits(length)
     
     def generate_random_bases(self, length):
         """Генерирует случайную последовательность базисов ('+' или '×') заданной длины"""
-        return [random.choice(['+', '×']) for _ in range(length)]
+        return ['+' if bit == 0 else '×' for bit in self.random_bits(length)]
     
     def encode_bits(self, bits, bases):
         """Кодирует биты в квантовые состояния в соответствии с выбранными базисами"""
@@ -45,7 +79,9 @@ class QuantumBB84:
     def measure_states(self, states, bases):
         """Измеряет квантовые состояния в соответствии с выбранными базисами"""
         result = []
-        for state, basis in zip(states, bases):
+        # Случайные исходы для измерений в неподходящем базисе берутся пакетом
+        coins = self.random_bits(min(len(states), len(bases)))
+        for state, basis, coin in zip(states, bases, coins):
             if basis == '+':
                 # Если использовался прямоугольный базис, интерпретируем |0⟩ как 0, |1⟩ как 1
                 if state == "|0⟩":
@@ -54,7 +90,7 @@ class QuantumBB84:
                     result.append(1)
                 else:
                     # Если состояние в другом базисе, результат случайный
-                    result.append(random.randint(0, 1))
+                    result.append(coin)
             elif basis == '×':
                 # Если использовался диагональный базис, интерпретируем |+⟩ как 0, |-⟩ как 1
                 if state == "|+⟩":
@@ -63,7 +99,7 @@ class QuantumBB84:
                     result.append(1)
                 else:
                     # Если состояние в другом базисе, результат случайный
-                    result.append(random.randint(0, 1))
+                    result.append(coin)
         return result
     
     def simulate_eavesdropping(self, states, eavesdropper_bases):
@@ -71,7 +107,9 @@ class QuantumBB84:
         eavesdropped_bits = []  # Биты, которые получит злоумышленник
         modified_states = []    # Измененные состояния после вмешательства злоумышленника
         
-        for state, basis in zip(states, eavesdropper_bases):
+        # Случайные исходы для измерений в неподходящем базисе берутся пакетом
+        coins = self.random_bits(min(len(states), len(eavesdropper_bases)))
+        for state, basis, coin in zip(states, eavesdropper_bases, coins):
             # Злоумышленник измеряет с использованием собственных базисов
             if basis == '+':
                 # Измерение в прямом базисе (+)
@@ -81,7 +119,7 @@ class QuantumBB84:
                     new_state = state  # Состояние не меняется при измерении в правильном базисе
                 else:  # |+⟩ или |-⟩
                     # При измерении в неподходящем базисе результат случаен
-                    eavesdropped_bit = random.randint(0, 1)  # Случайный результат
+                    eavesdropped_bit = coin  # Случайный результат
                     new_state = "|0⟩" if eavesdropped_bit == 0 else "|1⟩"  # Состояние коллапсирует в новый базис
             else:  # basis == '×'
                 # Измерение в диагональном базисе (×)
@@ -91,7 +129,7 @@ class QuantumBB84:
                     new_state = state  # Состояние не меняется при измерении в правильном базисе
                 else:  # |0⟩ или |1⟩
                     # При измерении в неподходящем базисе результат случаен
-                    eavesdropped_bit = random.randint(0, 1)  # Случайный результат
+                    eavesdropped_bit = coin  # Случайный результат
                     new_state = "|+⟩" if eavesdropped_bit == 0 else "|-⟩"  # Состояние коллапсирует в новый базис
                     
             eavesdropped_bits.append(eavesdropped_bit)
@@ -171,6 +209,996 @@ class QuantumBB84:
             'eve_present': self.eavesdropping
         }
 
+class SecretsGenerator:
+    """
+    Криптографически стойкий источник случайности для VectorizedBB84.
+    
+    Реализует используемую симулятором часть интерфейса numpy.random.Generator
+    (integers, random, permutation, spawn) поверх os.urandom - для настоящего ключевого материала.
+    """
+    
+    def integers(self, low, high, size=None, dtype=np.int64):
+        """Равномерные целые числа из [low, high)"""
+        span = high - low
+        count = int(np.prod(size)) if size is not None else 1
+        # Отбрасываем значения из неполного последнего интервала, чтобы избежать смещения
+        limit = (1 << 64) // span * span
+        values = np.empty(0, dtype=np.uint64)
+        while len(values) < count:
+            draw = np.frombuffer(os.urandom(8 * (count - len(values))), dtype=np.uint64)
+            values = np.concatenate([values, draw[draw < limit]])
+        result = (values % np.uint64(span)).astype(np.int64) + low
+        return result.astype(dtype).reshape(size) if size is not None else dtype(result[0])
+    
+    def random(self, size=None, dtype=np.float64):
+        """Равномерные числа из [0, 1)"""
+        count = int(np.prod(size)) if size is not None else 1
+        bits = 24 if dtype == np.float32 else 53
+        values = np.frombuffer(os.urandom(8 * count), dtype=np.uint64) >> np.uint64(64 - bits)
+        result = (values * (1.0 / (1 << bits))).astype(dtype)
+        return result.reshape(size) if size is not None else result[0]
+    
+    def permutation(self, n):
+        """Случайная перестановка чисел 0..n-1 (сортировка по случайным 64-битным ключам)"""
+        keys = np.frombuffer(os.urandom(8 * n), dtype=np.uint64)
+        return np.argsort(keys, kind='stable')
+    
+    def spawn(self, count):
+        """Системный источник не имеет состояния - все потоки независимы"""
+        return [SecretsGenerator() for _ in range(count)]
+
+
+# Представление данных в массивах VectorizedBB84:
+#   биты - uint8 (0 или 1);
+#   базисы - uint8: 0 - прямоугольный '+', 1 - диагональный '×',
+#            2 - промежуточный базис Брейдбарта (повернут на π/8, используется только Евой);
+#   состояния - uint8: 2 * базис + бит, т.е. 0 - |0⟩, 1 - |1⟩, 2 - |+⟩, 3 - |-⟩,
+#            4 и 5 - состояния базиса Брейдбарта.
+BREIDBART_BASIS = 2
+BASIS_SYMBOLS = np.array(['+', '×', 'β'])
+STATE_SYMBOLS = np.array(["|0⟩", "|1⟩", "|+⟩", "|-⟩", "|β0⟩", "|β1⟩"])
+
+# Вероятности для базиса Брейдбарта: cos²(π/8) ≈ 0.854 и sin²(π/8) ≈ 0.146
+_COS2_PI_8 = np.cos(np.pi / 8) ** 2
+_SIN2_PI_8 = np.sin(np.pi / 8) ** 2
+
+# Вероятность получить бит 1 при измерении состояния (строка) в базисе (столбец):
+# в своем базисе результат детерминирован, в чужом - случаен
+MEASURE_ONE_PROBABILITY = np.array([
+    [0.0, 0.5, _SIN2_PI_8],         # |0⟩
+    [1.0, 0.5, _COS2_PI_8],         # |1⟩
+    [0.5, 0.0, _SIN2_PI_8],         # |+⟩
+    [0.5, 1.0, _COS2_PI_8],         # |-⟩
+    [_SIN2_PI_8, _SIN2_PI_8, 0.0],  # |β0⟩
+    [_COS2_PI_8, _COS2_PI_8, 1.0],  # |β1⟩
+], dtype=np.float32)
+
+
+def bases_to_symbols(bases):
+    """Преобразует массив базисов в список символов '+'/'×' (как в QuantumBB84)"""
+    return BASIS_SYMBOLS[np.asarray(bases)].tolist()
+
+
+def states_to_symbols(states):
+    """Преобразует массив состояний в список строк вида "|0⟩" (как в QuantumBB84)"""
+    return STATE_SYMBOLS[np.asarray(states)].tolist()
+
+
+# Результат перехвата: базисы и биты Евы, маска перехваченных фотонов и состояния, ушедшие Бобу
+Interception = namedtuple('Interception', ['bases', 'bits', 'intercepted', 'states'])
+
+
+class EveStrategy(ABC):
+    """
+    Базовый класс стратегии Евы для VectorizedBB84.
+    
+    Ева перехватывает долю fraction фотонов, измеряет их в базисах,
+    выбранных choose_bases(), и пересылает Бобу состояние, соответствующее
+    результату измерения. Все операции выполняются над массивами целиком.
+    """
+    
+    def __init__(self, fraction=1.0):
+        self.fraction = fraction
+    
+    @abstractmethod
+    def choose_bases(self, shape, rng):
+        """Возвращает базисы измерения Евы для пакета фотонов"""
+    
+    def apply(self, states, rng):
+        """Применяет стратегию к пакету состояний и возвращает Interception"""
+        shape = np.shape(states)
+        bases = self.choose_bases(shape, rng)
+        probability = MEASURE_ONE_PROBABILITY[states, bases]
+        bits = (rng.random(shape, dtype=np.float32) < probability).astype(np.uint8)
+        # Состояние коллапсирует в базис Евы в соответствии с результатом измерения
+        resent = (bases << 1) | bits
+        if self.fraction >= 1:
+            return Interception(bases, bits, np.ones(shape, dtype=bool), resent)
+        intercepted = rng.random(shape, dtype=np.float32) < self.fraction
+        return Interception(bases, bits, intercepted, np.where(intercepted, resent, states))
+
+
+class InterceptResend(EveStrategy):
+    """Перехват с пересылкой в случайном базисе '+' или '×' (QBER 25% при полном перехвате)"""
+    
+    def choose_bases(self, shape, rng):
+        return rng.integers(0, 2, size=shape, dtype=np.uint8)
+
+
+class FixedBasisAttack(EveStrategy):
+    """Перехват с измерением всегда в одном базисе basis (0 - '+', 1 - '×')"""
+    
+    def __init__(self, basis=0, fraction=1.0):
+        super().__init__(fraction)
+        self.basis = basis
+    
+    def choose_bases(self, shape, rng):
+        return np.full(shape, self.basis, dtype=np.uint8)
+
+
+class BreidbartAttack(EveStrategy):
+    """
+    Перехват в промежуточном базисе Брейдбарта: Ева угадывает бит с
+    вероятностью cos²(π/8) ≈ 85.4% независимо от базиса Алисы, внося QBER 25%.
+    """
+    
+    def choose_bases(self, shape, rng):
+        return np.full(shape, BREIDBART_BASIS, dtype=np.uint8)
+
+
+EVE_STRATEGIES = {
+    'intercept_resend': InterceptResend,
+    'fixed_basis': FixedBasisAttack,
+    'breidbart': BreidbartAttack,
+}
+
+
+class ChannelModel(ABC):
+    """
+    Базовый класс модели квантового канала для VectorizedBB84.
+    
+    Модель получает массив состояний (2 * базис + бит) и булев массив
+    detected (дошел ли фотон до детектора Боба и вызвал ли срабатывание)
+    и возвращает их измененные копии. Модели применяются последовательно
+    в порядке списка channel и работают с массивами любой формы.
+    """
+    
+    @abstractmethod
+    def apply(self, states, detected, rng):
+        """Применяет модель к пакету фотонов и возвращает (states, detected)"""
+
+
+def _replace_with_random_states(states, mask, rng):
+    """Заменяет состояния в позициях mask случайными состояниями BB84 (полностью смешанное состояние)"""
+    states = states.copy()
+    states[mask] = rng.integers(0, 4, size=int(np.count_nonzero(mask)), dtype=np.uint8)
+    return states
+
+
+class FiberLoss(ChannelModel):
+    """Потери фотонов в волокне: пропускание 10^(-attenuation * distance / 10)"""
+    
+    def __init__(self, distance_km, attenuation_db_per_km=0.2):
+        self.distance_km = distance_km
+        self.attenuation_db_per_km = attenuation_db_per_km
+    
+    @property
+    def transmittance(self):
+        """Доля фотонов, прошедших через канал"""
+        return 10 ** (-self.attenuation_db_per_km * self.distance_km / 10)
+    
+    def apply(self, states, detected, rng):
+        return states, detected & (rng.random(states.shape, dtype=np.float32) < self.transmittance)
+
+
+class DetectorEfficiency(ChannelModel):
+    """Квантовая эффективность детектора: фотон регистрируется с вероятностью efficiency"""
+    
+    def __init__(self, efficiency):
+        self.efficiency = efficiency
+    
+    def apply(self, states, detected, rng):
+        return states, detected & (rng.random(states.shape, dtype=np.float32) < self.efficiency)
+
+
+class BitFlipNoise(ChannelModel):
+    """Шум переворота бита: состояние меняется на ортогональное с вероятностью probability"""
+    
+    def __init__(self, probability):
+        self.probability = probability
+    
+    def apply(self, states, detected, rng):
+        flips = rng.random(states.shape, dtype=np.float32) < self.probability
+        return states ^ flips.astype(np.uint8), detected
+
+
+class DepolarizingNoise(ChannelModel):
+    """
+    Деполяризующий шум: с вероятностью probability состояние заменяется
+    полностью смешанным (случайное состояние BB84), что дает probability / 2 ошибок.
+    """
+    
+    def __init__(self, probability):
+        self.probability = probability
+    
+    def apply(self, states, detected, rng):
+        mask = rng.random(states.shape, dtype=np.float32) < self.probability
+        return _replace_with_random_states(states, mask, rng), detected
+
+
+class DarkCounts(ChannelModel):
+    """
+    Темновые отсчеты: детектор срабатывает без фотона с вероятностью
+    probability, результат измерения при этом случаен.
+    """
+    
+    def __init__(self, probability):
+        self.probability = probability
+    
+    def apply(self, states, detected, rng):
+        clicks = ~detected & (rng.random(states.shape, dtype=np.float32) < self.probability)
+        return _replace_with_random_states(states, clicks, rng), detected | clicks
+
+
+def block_parities(bits, block_size):
+    """Вычисляет четности последовательных блоков по block_size битов (последний может быть короче)"""
+    if len(bits) == 0:
+        return np.zeros(0, dtype=np.uint8)
+    return np.bitwise_xor.reduceat(bits, np.arange(0, len(bits), block_size))
+
+
+def _prefix_parities(bits):
+    """Префиксные четности: четность битов [lo, hi) равна p[hi] ^ p[lo]"""
+    return np.concatenate([np.zeros(1, dtype=np.uint8), np.bitwise_xor.accumulate(bits)])
+
+
+def _bisect_blocks(alice_bits, bob_bits, lo, hi):
+    """
+    Параллельный двоичный поиск ошибки в блоках [lo, hi) с разной четностью.
+    
+    На каждом шаге Алиса раскрывает четность левой половины каждого
+    активного блока (один бит утечки на блок), Боб сравнивает ее со своей
+    и продолжает поиск в половине с расхождением.
+    Возвращает позиции найденных ошибок и число раскрытых битов четности.
+    """
+    alice_prefix = _prefix_parities(alice_bits)
+    bob_prefix = _prefix_parities(bob_bits)
+    lo, hi = lo.copy(), hi.copy()
+    leaked = 0
+    active = hi - lo > 1
+    while active.any():
+        mid = (lo + hi) // 2
+        left_differs = (alice_prefix[mid] ^ alice_prefix[lo]) != (bob_prefix[mid] ^ bob_prefix[lo])
+        leaked += int(np.count_nonzero(active))
+        hi = np.where(active & left_differs, mid, hi)
+        lo = np.where(active & ~left_differs, mid, lo)
+        active = hi - lo > 1
+    return lo, leaked
+
+
+# Нижняя граница оценки QBER для выбора размера блоков Cascade: оценка по
+# выборке может оказаться нулевой, хотя ошибки в ключе есть
+CASCADE_MIN_ERROR_RATE = 0.01
+
+
+def cascade_reconcile(alice_key, bob_key, error_rate, passes=4, rng=None):
+    """
+    Согласует ключ Боба с ключом Алисы по протоколу Cascade.
+    
+    На проходе i ключ переставляется (общей открытой перестановкой; на первом
+    проходе - без перестановки) и разбивается на блоки размера k * 2^i,
+    где k ≈ 0.73 / error_rate (error_rate не меньше CASCADE_MIN_ERROR_RATE,
+    блок не больше половины ключа). Алиса публикует четности блоков, в блоках с
+    расхождением ошибка находится двоичным поиском. Исправление бита меняет
+    четность блоков предыдущих проходов, поэтому они перепроверяются
+    (каскадный эффект), пока расхождений не останется. Четности считаются
+    векторно сразу для всех блоков прохода.
+    
+    Args:
+        alice_key: просеянный ключ Алисы
+        bob_key: просеянный ключ Боба
+        error_rate: оценка частоты ошибок (QBER)
+        passes: количество проходов
+        rng: numpy.random.Generator для открытых перестановок
+    
+    Returns:
+        (исправленный ключ Боба, количество раскрытых битов четности)
+    """
+    alice_key = np.asarray(alice_key, dtype=np.uint8)
+    bob_key = np.array(bob_key, dtype=np.uint8)
+    if len(alice_key) != len(bob_key):
+        raise ValueError("Ключи Алисы и Боба должны быть одинаковой длины")
+    n = len(alice_key)
+    if n == 0:
+        return bob_key, 0
+    rng = rng if rng is not None else np.random.default_rng()
+    
+    first_block = max(4, int(np.ceil(0.73 / max(error_rate, CASCADE_MIN_ERROR_RATE))))
+    # Четность всего ключа не меняется при перестановке - такие проходы бесполезны
+    max_block = max(1, n // 2)
+    leaked = 0
+    # Для каждого прохода: перестановка, размер блока, ключ Алисы и ее четности в порядке перестановки
+    pass_data = []
+    
+    for i in range(passes):
+        block_size = min(first_block << i, max_block)
+        permutation = np.arange(n) if i == 0 else rng.permutation(n)
+        alice_permuted = alice_key[permutation]
+        alice_parities = block_parities(alice_permuted, block_size)
+        leaked += len(alice_parities)
+        pass_data.append((permutation, block_size, alice_permuted, alice_parities))
+        
+        # Каскад: исправляем расхождения во всех проходах, пока они есть
+        corrected = True
+        while corrected:
+            corrected = False
+            for permutation, block_size, alice_permuted, alice_parities in pass_data:
+                bob_permuted = bob_key[permutation]
+                odd = np.flatnonzero(block_parities(bob_permuted, block_size) != alice_parities)
+                if odd.size == 0:
+                    continue
+                lo = odd * block_size
+                hi = np.minimum(lo + block_size, n)
+                positions, cost = _bisect_blocks(alice_permuted, bob_permuted, lo, hi)
+                bob_key[permutation[positions]] ^= 1
+                leaked += cost
+                corrected = True
+    
+    return bob_key, leaked
+
+
+# Запас (в битах) на статистические флуктуации и параметр безопасности при сжатии ключа
+PRIVACY_MARGIN = 64
+
+
+def binary_entropy(p):
+    """Двоичная энтропия h(p) = -p*log2(p) - (1-p)*log2(1-p)"""
+    if p <= 0 or p >= 1:
+        return 0.0
+    return float(-p * np.log2(p) - (1 - p) * np.log2(1 - p))
+
+
+def secure_key_length(key_length, error_rate, leaked_bits=0, margin=PRIVACY_MARGIN):
+    """
+    Длина итогового ключа после усиления секретности:
+    l = n * (1 - h(e)) - leak - margin, но не меньше нуля.
+    """
+    length = key_length * (1 - binary_entropy(error_rate)) - leaked_bits - margin
+    return max(0, int(length))
+
+
+def toeplitz_hash(key, seed_bits, output_length):
+    """
+    Умножает ключ на двоичную матрицу Тёплица над GF(2).
+    
+    Матрица размера output_length x n задается seed_bits длины
+    n + output_length - 1: T[i][j] = seed[i - j + n - 1]. Произведение
+    T * x совпадает с отрезком свертки seed и x, поэтому считается через
+    БПФ за O(n log n) вместо O(n^2).
+    
+    Args:
+        key: биты ключа (n)
+        seed_bits: биты, задающие матрицу (n + output_length - 1)
+        output_length: длина результата
+    
+    Returns:
+        numpy-массив uint8 из output_length битов
+    """
+    key = np.asarray(key, dtype=np.uint8)
+    seed_bits = np.asarray(seed_bits, dtype=np.uint8)
+    n = len(key)
+    if output_length <= 0 or n == 0:
+        return np.zeros(max(output_length, 0), dtype=np.uint8)
+    if len(seed_bits) != n + output_length - 1:
+        raise ValueError("Длина seed_bits должна быть равна len(key) + output_length - 1")
+    # Достаточно циклической свертки длины len(seed_bits): "завернувшиеся"
+    # члены попадают в индексы меньше n - 1 и не затрагивают результат
+    fft_size = 1 << (len(seed_bits) - 1).bit_length()
+    spectrum = np.fft.rfft(key, fft_size) * np.fft.rfft(seed_bits, fft_size)
+    convolution = np.fft.irfft(spectrum, fft_size)[n - 1:n - 1 + output_length]
+    return (np.rint(convolution).astype(np.int64) & 1).astype(np.uint8)
+
+
+def privacy_amplification(key, error_rate, leaked_bits=0, margin=PRIVACY_MARGIN, rng=None):
+    """
+    Сжимает согласованный ключ, удаляя информацию, которую мог получить Ева.
+    
+    Длина результата определяется по secure_key_length, матрица Тёплица
+    выбирается случайно и публикуется (возвращается вместе с ключом,
+    чтобы вторая сторона могла применить то же хеширование).
+    
+    Returns:
+        (итоговый ключ, биты матрицы Тёплица)
+    """
+    key = np.asarray(key, dtype=np.uint8)
+    output_length = secure_key_length(len(key), error_rate, leaked_bits, margin)
+    if output_length == 0:
+        return np.zeros(0, dtype=np.uint8), np.zeros(0, dtype=np.uint8)
+    rng = rng if rng is not None else np.random.default_rng()
+    seed_bits = rng.integers(0, 2, size=len(key) + output_length - 1, dtype=np.uint8)
+    return toeplitz_hash(key, seed_bits, output_length), seed_bits
+
+
+# Порог QBER, выше которого секретный ключ для BB84 получить невозможно
+QBER_ABORT_THRESHOLD = 0.11
+
+
+def wilson_interval(errors, trials, confidence=0.95):
+    """
+    Доверительный интервал Уилсона для доли ошибок errors / trials.
+    
+    Returns:
+        (нижняя граница, верхняя граница); при trials == 0 - (0.0, 1.0)
+    """
+    if trials == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = errors / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    spread = z * np.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, float(center - spread)), min(1.0, float(center + spread))
+
+
+# Сколько фотонов подряд без единого просеянного бита допускает iter_key_blocks()
+KEY_BLOCKS_MAX_EMPTY_PHOTONS = 1 << 24
+
+
+class VectorizedBB84(QuantumBB84):
+    """
+    Векторизованная симуляция протокола BB84 на массивах NumPy.
+    
+    Интерфейс совпадает с QuantumBB84, но биты, базисы и состояния хранятся
+    в массивах uint8, а кодирование, измерение, перехват, просеивание ключа
+    и расчет частоты ошибок выполняются векторными операциями без циклов Python.
+    
+    channel - список моделей канала (ChannelModel), через которые проходят
+    фотоны на пути к Бобу; по умолчанию канал идеальный.
+    eve - стратегия Евы (EveStrategy) при подслушивании; по умолчанию
+    перехват всех фотонов в случайном базисе.
+    """
+    
+    def __init__(self, length=20, rng=None, seed=None, channel=None, eve=None):
+        """Инициализация с указанной длиной последовательности, моделью канала и стратегией Евы"""
+        self.channel = list(channel or [])
+        self.eve = eve if eve is not None else InterceptResend()
+        super().__init__(length, rng, seed)
+    
+    def make_rng(self, rng=None, seed=None):
+        """
+        Создает источник случайности для симуляции.
+        
+        rng - numpy.random.Generator (или SecretsGenerator для настоящего
+        ключевого материала); seed - начальное значение или SeedSequence.
+        """
+        if rng is not None:
+            return rng
+        return np.random.default_rng(seed)
+    
+    def spawn(self, count):
+        """
+        Создает count симуляторов с независимыми потоками случайных чисел.
+        
+        Потоки порождаются из генератора текущего симулятора, поэтому
+        параллельные запуски не делят общее состояние и воспроизводимы.
+        """
+        return [type(self)(self.length, rng=rng, channel=self.channel, eve=self.eve)
+                for rng in self.rng.spawn(count)]
+    
+    def reset(self):
+        """Сбрасывает все данные симуляции"""
+        super().reset()
+        self.reconciled_key_bob = []
+        self.leaked_bits = 0
+        self.final_key_alice = []
+        self.final_key_bob = []
+        self.error_interval = (0.0, 1.0)
+        self.sampled_bits = 0
+        self.aborted = False
+        self.photons_sent = 0
+        self.detected = []
+        self.eve_intercepted = []
+    
+    def generate_random_bits(self, length):
+        """Генерирует массив случайных битов заданной длины"""
+        return self.rng.integers(0, 2, size=length, dtype=np.uint8)
+    
+    def generate_random_bases(self, length):
+        """Генерирует массив случайных базисов (0 - '+', 1 - '×') заданной длины"""
+        return self.rng.integers(0, 2, size=length, dtype=np.uint8)
+    
+    def encode_bits(self, bits, bases):
+        """Кодирует биты в квантовые состояния в соответствии с выбранными базисами"""
+        return (np.asarray(bases, dtype=np.uint8) << 1) | np.asarray(bits, dtype=np.uint8)
+    
+    def measure_states(self, states, bases):
+        """Измеряет квантовые состояния в соответствии с выбранными базисами"""
+        probability = MEASURE_ONE_PROBABILITY[states, bases]
+        return (self.rng.random(probability.shape, dtype=np.float32) < probability).astype(np.uint8)
+    
+    def simulate_eavesdropping(self, states, eavesdropper_bases):
+        """Симулирует перехват и измерение квантовых состояний злоумышленником"""
+        eavesdropped_bits = self.measure_states(states, eavesdropper_bases)
+        # Состояние коллапсирует в базис злоумышленника в соответствии с результатом измерения
+        modified_states = self.encode_bits(eavesdropped_bits, eavesdropper_bases)
+        return eavesdropped_bits, modified_states
+    
+    def prepare_eve_data(self):
+        """Подготавливает данные для Евы в соответствии со стратегией self.eve"""
+        interception = self.eve.apply(self.quantum_states, self.rng)
+        self.eve_bases, self.eve_bits, self.eve_intercepted, self.modified_states = interception
+        return self.eve_bases, self.eve_bits, self.modified_states
+    
+    def compare_bases_and_sift_key(self, alice_bases, bob_bases, bits):
+        """Сравнивает базисы измерений и сохраняет только совпадающие биты для ключа"""
+        matching_indices = np.flatnonzero(np.asarray(alice_bases) == np.asarray(bob_bases))
+        return np.asarray(bits)[matching_indices], matching_indices
+    
+    def calculate_error_rate(self, original_bits, received_bits):
+        """Вычисляет частоту ошибок между исходными и полученными битами"""
+        if len(original_bits) == 0:
+            return 0
+        return np.count_nonzero(np.asarray(original_bits) != np.asarray(received_bits)) / len(original_bits)
+    
+    def transmit(self, states):
+        """Пропускает состояния через модели канала и возвращает (states, detected)"""
+        detected = np.ones(np.shape(states), dtype=bool)
+        for model in self.channel:
+            states, detected = model.apply(states, detected, self.rng)
+        return states, detected
+    
+    def prepare_bob_data(self):
+        """Подготавливает данные для Боба: базисы, отметки регистрации и измеренные биты"""
+        self.bob_bases = self.generate_random_bases(self.length)
+        states_to_measure = self.modified_states if self.eavesdropping else self.quantum_states
+        received_states, self.detected = self.transmit(states_to_measure)
+        self.bob_measured_bits = self.measure_states(received_states, self.bob_bases)
+        return self.bob_bases, self.bob_measured_bits
+    
+    def sift_keys(self):
+        """Сравнивает базисы и генерирует просеянные ключи по зарегистрированным фотонам"""
+        self.matching_indices = np.flatnonzero(self.detected & (self.alice_bases == self.bob_bases))
+        self.sifted_key_alice = self.alice_bits[self.matching_indices]
+        self.sifted_key_bob = self.bob_measured_bits[self.matching_indices]
+        self.error_rate = self.calculate_error_rate(self.sifted_key_alice, self.sifted_key_bob)
+        return self.sifted_key_alice, self.sifted_key_bob, self.error_rate
+    
+    def sample_error_rate(self, alice_key, bob_key, sample_fraction):
+        """
+        Публично сравнивает случайную долю sample_fraction позиций ключа.
+        
+        Returns:
+            (количество ошибок в выборке, размер выборки,
+             ключ Алисы без выборки, ключ Боба без выборки)
+        """
+        sampled = self.rng.random(len(alice_key), dtype=np.float32) < sample_fraction
+        errors = np.count_nonzero(alice_key[sampled] != bob_key[sampled])
+        kept = ~sampled
+        return int(errors), int(np.count_nonzero(sampled)), alice_key[kept], bob_key[kept]
+    
+    def estimate_error_rate(self, sample_fraction=0.1, confidence=0.95):
+        """
+        Оценивает QBER по случайной выборке просеянного ключа.
+        
+        Раскрытые при сравнении биты удаляются из ключей. Оценка сохраняется
+        в error_rate, доверительный интервал - в error_interval.
+        """
+        errors, trials, self.sifted_key_alice, self.sifted_key_bob = self.sample_error_rate(
+            self.sifted_key_alice, self.sifted_key_bob, sample_fraction)
+        self.sampled_bits = trials
+        self.error_rate = errors / trials if trials else 0
+        self.error_interval = wilson_interval(errors, trials, confidence)
+        return self.error_rate, self.error_interval
+    
+    def run_sampled(self, with_eavesdropping=False, sample_fraction=0.1,
+                    threshold=QBER_ABORT_THRESHOLD, confidence=0.95, photon_block=1 << 16):
+        """
+        Передает self.length фотонов блоками, оценивая QBER по выборке на лету.
+        
+        После каждого блока часть просеянных битов публично сравнивается и
+        отбрасывается, а оценка QBER уточняется. Как только нижняя граница
+        доверительного интервала превышает threshold, передача прекращается:
+        aborted = True, ключи очищаются. Промежуточные массивы по фотонам
+        не сохраняются.
+        """
+        if photon_block <= 0:
+            raise ValueError("Размер блока должен быть положительным")
+        self.reset()
+        self.eavesdropping = with_eavesdropping
+        alice_parts, bob_parts = [], []
+        errors = trials = sent = 0
+        
+        while sent < self.length:
+            size = min(photon_block, self.length - sent)
+            alice_sifted, bob_sifted = self.simulate_block(size, with_eavesdropping)
+            sent += size
+            block_errors, block_trials, alice_kept, bob_kept = self.sample_error_rate(
+                alice_sifted, bob_sifted, sample_fraction)
+            errors += block_errors
+            trials += block_trials
+            alice_parts.append(alice_kept)
+            bob_parts.append(bob_kept)
+            self.error_interval = wilson_interval(errors, trials, confidence)
+            if self.error_interval[0] > threshold:
+                self.aborted = True
+                break
+        
+        self.photons_sent = sent
+        self.sampled_bits = trials
+        self.error_rate = errors / trials if trials else 0
+        if self.aborted:
+            alice_parts, bob_parts = [], []
+        self.sifted_key_alice = np.concatenate(alice_parts) if alice_parts else np.zeros(0, dtype=np.uint8)
+        self.sifted_key_bob = np.concatenate(bob_parts) if bob_parts else np.zeros(0, dtype=np.uint8)
+        
+        return {
+            'sifted_key_alice': self.sifted_key_alice,
+            'sifted_key_bob': self.sifted_key_bob,
+            'error_rate': self.error_rate,
+            'error_interval': self.error_interval,
+            'sampled_bits': self.sampled_bits,
+            'photons_sent': self.photons_sent,
+            'aborted': self.aborted,
+            'eve_present': self.eavesdropping
+        }
+    
+    def reconcile_keys(self, passes=4):
+        """
+        Исправляет ошибки в просеянном ключе Боба протоколом Cascade.
+        
+        Результат сохраняется в reconciled_key_bob, количество раскрытых
+        при согласовании битов четности - в leaked_bits.
+        """
+        self.reconciled_key_bob, self.leaked_bits = cascade_reconcile(
+            self.sifted_key_alice, self.sifted_key_bob, self.error_rate, passes, self.rng)
+        return self.reconciled_key_bob, self.leaked_bits
+    
+    def amplify_privacy(self, margin=PRIVACY_MARGIN):
+        """
+        Усиливает секретность ключа хешированием Тёплица.
+        
+        Используется согласованный ключ Боба (если reconcile_keys уже
+        вызывался) и учитываются раскрытые при согласовании биты.
+        Результаты сохраняются в final_key_alice и final_key_bob.
+        """
+        bob_key = self.reconciled_key_bob if len(self.reconciled_key_bob) else self.sifted_key_bob
+        self.final_key_alice, seed_bits = privacy_amplification(
+            self.sifted_key_alice, self.error_rate, self.leaked_bits, margin, self.rng)
+        self.final_key_bob = toeplitz_hash(bob_key, seed_bits, len(self.final_key_alice))
+        return self.final_key_alice, self.final_key_bob
+    
+    def simulate_block(self, length, with_eavesdropping=False):
+        """
+        Моделирует передачу блока фотонов и возвращает только просеянные ключи.
+        
+        В отличие от run_simulation() промежуточные массивы не сохраняются
+        в атрибутах симулятора и освобождаются сразу после просеивания.
+        """
+        alice_bits = self.generate_random_bits(length)
+        alice_bases = self.generate_random_bases(length)
+        states = self.encode_bits(alice_bits, alice_bases)
+        if with_eavesdropping:
+            states = self.eve.apply(states, self.rng).states
+        states, detected = self.transmit(states)
+        bob_bases = self.generate_random_bases(length)
+        bob_bits = self.measure_states(states, bob_bases)
+        matching = detected & (alice_bases == bob_bases)
+        return alice_bits[matching], bob_bits[matching]
+    
+    def iter_key_blocks(self, target_bits, key_block_bits=1 << 16, photon_block=1 << 20,
+                        with_eavesdropping=False, max_photons=None):
+        """
+        Непрерывно генерирует просеянный ключ блоками до достижения target_bits битов.
+        
+        Фотоны передаются пакетами по photon_block, просеянные биты накапливаются
+        и выдаются парами массивов (ключ Алисы, ключ Боба) по key_block_bits битов
+        (последний блок может быть короче). Расход памяти ограничен размерами
+        пакета и блока и не зависит от target_bits.
+        
+        max_photons ограничивает общее число переданных фотонов: при его
+        исчерпании выдается накопленный остаток и генерация прекращается,
+        даже если target_bits не достигнуто. Если KEY_BLOCKS_MAX_EMPTY_PHOTONS
+        фотонов подряд не дали ни одного просеянного бита (канал не пропускает
+        фотоны), возбуждается RuntimeError.
+        """
+        if key_block_bits <= 0 or photon_block <= 0:
+            raise ValueError("Размеры блоков должны быть положительными")
+        alice_rest = bob_rest = np.zeros(0, dtype=np.uint8)
+        remaining = target_bits
+        sent = 0
+        empty_photons = 0
+        
+        while remaining > 0:
+            if max_photons is not None and sent >= max_photons:
+                if len(alice_rest):
+                    yield alice_rest, bob_rest
+                return
+            size = photon_block if max_photons is None else min(photon_block, max_photons - sent)
+            alice_sifted, bob_sifted = self.simulate_block(size, with_eavesdropping)
+            sent += size
+            empty_photons = empty_photons + size if len(alice_sifted) == 0 else 0
+            if empty_photons >= KEY_BLOCKS_MAX_EMPTY_PHOTONS:
+                raise RuntimeError("Канал не пропускает фотоны: нет просеянных битов")
+            
+            # Остаток предыдущего пакета и новый пакет объединяются один раз
+            alice_buffer = np.concatenate([alice_rest, alice_sifted])
+            bob_buffer = np.concatenate([bob_rest, bob_sifted])
+            offset = 0
+            while remaining > 0 and len(alice_buffer) - offset >= min(key_block_bits, remaining):
+                block_end = offset + min(key_block_bits, remaining)
+                yield alice_buffer[offset:block_end], bob_buffer[offset:block_end]
+                remaining -= block_end - offset
+                offset = block_end
+            alice_rest, bob_rest = alice_buffer[offset:].copy(), bob_buffer[offset:].copy()
+        
+# Максимальное число фотонов в одном пакете испытаний (ограничивает память)
+BATCH_MAX_PHOTONS = 1 << 22
+
+
+def _trial_sums(trials, length, with_eavesdropping, seed, detection_threshold, channel=None, eve=None):
+    """
+    Выполняет серию независимых испытаний BB84 и возвращает суммы для агрегирования.
+    
+    Испытания обрабатываются пакетами: каждый пакет - двумерные массивы
+    (испытание x фотон), поэтому отдельные списки по испытаниям не создаются.
+    """
+    simulator = VectorizedBB84(length, seed=seed, channel=channel, eve=eve)
+    sums = {'trials': 0, 'qber': 0.0, 'qber_sq': 0.0, 'sifted': 0.0, 'sifted_sq': 0.0, 'detected': 0,
+            'eve_correct': 0}
+    rows = max(1, BATCH_MAX_PHOTONS // max(length, 1))
+    
+    for start in range(0, trials, rows):
+        shape = (min(rows, trials - start), length)
+        alice_bits = simulator.generate_random_bits(shape)
+        alice_bases = simulator.generate_random_bases(shape)
+        states = simulator.encode_bits(alice_bits, alice_bases)
+        eve_correct = np.zeros(shape, dtype=bool)
+        if with_eavesdropping:
+            interception = simulator.eve.apply(states, simulator.rng)
+            states = interception.states
+            eve_correct = interception.intercepted & (interception.bits == alice_bits)
+        states, detected = simulator.transmit(states)
+        bob_bases = simulator.generate_random_bases(shape)
+        bob_bits = simulator.measure_states(states, bob_bases)
+        
+        matching = detected & (alice_bases == bob_bases)
+        sifted = np.count_nonzero(matching, axis=1)
+        errors = np.count_nonzero(matching & (alice_bits != bob_bits), axis=1)
+        qber = np.divide(errors, sifted, out=np.zeros(len(sifted)), where=sifted > 0)
+        
+        sums['trials'] += shape[0]
+        sums['qber'] += qber.sum()
+        sums['qber_sq'] += np.square(qber).sum()
+        sums['sifted'] += sifted.sum()
+        sums['sifted_sq'] += np.square(sifted, dtype=np.float64).sum()
+        sums['detected'] += int(np.count_nonzero(qber > detection_threshold))
+        sums['eve_correct'] += int(np.count_nonzero(matching & eve_correct))
+    return sums
+
+
+def _mean_and_variance(total, total_sq, count):
+    """Среднее и несмещенная дисперсия по сумме и сумме квадратов"""
+    if count == 0:
+        return 0.0, 0.0
+    mean = total / count
+    if count == 1:
+        return mean, 0.0
+    return mean, max(0.0, (total_sq - total * mean) / (count - 1))
+
+
+def run_batch(trials, length=20, with_eavesdropping=False, workers=None, seed=None,
+              detection_threshold=0.0, channel=None, eve=None):
+    """
+    Запускает серию независимых испытаний BB84 методом Монте-Карло.
+    
+    Испытания распределяются по пулу процессов; каждый процесс получает
+    собственный независимый поток случайных чисел. Возвращается только
+    агрегированная статистика, без списков по отдельным испытаниям.
+    
+    Args:
+        trials: количество испытаний
+        length: количество фотонов в одном испытании
+        with_eavesdropping: присутствует ли Ева
+        workers: количество процессов (None - по числу ядер, 1 - без пула)
+        seed: начальное значение для воспроизводимости
+        detection_threshold: подслушивание считается обнаруженным, если QBER больше порога
+        channel: список моделей канала (ChannelModel)
+        eve: стратегия Евы (EveStrategy), по умолчанию InterceptResend()
+    
+    Returns:
+        dict со средним и дисперсией QBER и длины просеянного ключа, вероятностью
+        обнаружения Евы и долей битов просеянного ключа, известных Еве (eve_agreement)
+    """
+    workers = workers or os.cpu_count() or 1
+    # Несколько заданий на процесс, чтобы выровнять нагрузку
+    chunks = min(trials, workers * 4) if workers > 1 else 1
+    sizes = [trials // chunks + (1 if i < trials % chunks else 0) for i in range(chunks)] if trials else []
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(size, length, with_eavesdropping, child, detection_threshold, channel, eve)
+            for size, child in zip(sizes, seeds)]
+    
+    if workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_trial_sums, *zip(*args)))
+    else:
+        parts = [_trial_sums(*arg) for arg in args]
+    
+    total = {key: sum(float(part[key]) for part in parts) for key in ('trials', 'qber', 'qber_sq', 'sifted', 'sifted_sq', 'detected', 'eve_correct')}
+    count = int(total['trials'])
+    mean_qber, var_qber = _mean_and_variance(total['qber'], total['qber_sq'], count)
+    mean_sifted, var_sifted = _mean_and_variance(total['sifted'], total['sifted_sq'], count)
+    return {
+        'trials': count,
+        'length': length,
+        'eve_present': with_eavesdropping,
+        'mean_qber': mean_qber,
+        'var_qber': var_qber,
+        'mean_sifted_length': mean_sifted,
+        'var_sifted_length': var_sifted,
+        'detection_probability': total['detected'] / count if count else 0.0,
+        'eve_agreement': total['eve_correct'] / total['sifted'] if total['sifted'] else 0.0
+    }
+
+
+# Параметры точки сетки по умолчанию для sweep()
+SWEEP_DEFAULTS = {
+    'length': 1000,
+    'intercept_probability': 0.0,
+    'attack': 'intercept_resend',
+    'noise': 0.0,
+    'distance_km': 0.0,
+    'attenuation_db_per_km': 0.2,
+    'detector_efficiency': 1.0,
+    'dark_count_probability': 0.0,
+}
+
+SWEEP_RESULT_FIELDS = ['mean_qber', 'var_qber', 'sifted_rate', 'secret_key_rate', 'detection_probability',
+                       'eve_agreement']
+
+
+def sweep_points(grid):
+    """
+    Разворачивает сетку параметров в список точек.
+    
+    grid - словарь {параметр: список значений}; параметры, которых нет
+    в grid, берутся из SWEEP_DEFAULTS.
+    """
+    unknown = set(grid) - set(SWEEP_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Неизвестные параметры сетки: {', '.join(sorted(unknown))}")
+    attacks = set(grid.get('attack', [])) - set(EVE_STRATEGIES)
+    if attacks:
+        raise ValueError(f"Неизвестные стратегии Евы: {', '.join(sorted(attacks))}")
+    names = list(SWEEP_DEFAULTS)
+    values = [list(grid.get(name, [SWEEP_DEFAULTS[name]])) for name in names]
+    return [dict(zip(names, combination)) for combination in product(*values)]
+
+
+def sweep_point_key(point, trials, seed, detection_threshold=QBER_ABORT_THRESHOLD):
+    """Ключ кэша точки: хеш параметров, числа испытаний, начального значения и порога обнаружения"""
+    payload = json.dumps({'point': point, 'trials': trials, 'seed': seed,
+                          'detection_threshold': detection_threshold}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+def sweep_channel(point):
+    """Строит список моделей канала для точки сетки"""
+    channel = []
+    if point['distance_km'] > 0:
+        channel.append(FiberLoss(point['distance_km'], point['attenuation_db_per_km']))
+    if point['noise'] > 0:
+        channel.append(DepolarizingNoise(point['noise']))
+    if point['detector_efficiency'] < 1:
+        channel.append(DetectorEfficiency(point['detector_efficiency']))
+    if point['dark_count_probability'] > 0:
+        channel.append(DarkCounts(point['dark_count_probability']))
+    return channel
+
+
+def _sweep_point(point, trials, key, seed, detection_threshold):
+    """Вычисляет одну точку сетки (выполняется в процессе пула)"""
+    eve = EVE_STRATEGIES[point['attack']](fraction=point['intercept_probability'])
+    # Без seed каждая точка получает новую энтропию от ОС
+    point_seed = None if seed is None else [seed, int(key, 16)]
+    stats = run_batch(trials, point['length'], point['intercept_probability'] > 0, workers=1,
+                      seed=point_seed, channel=sweep_channel(point), eve=eve,
+                      detection_threshold=detection_threshold)
+    sifted_rate = stats['mean_sifted_length'] / point['length'] if point['length'] else 0.0
+    # Асимптотическая доля секретных битов BB84: 1 - 2h(e)
+    secret_fraction = max(0.0, 1 - 2 * binary_entropy(stats['mean_qber']))
+    return {
+        **point,
+        'mean_qber': stats['mean_qber'],
+        'var_qber': stats['var_qber'],
+        'sifted_rate': sifted_rate,
+        'secret_key_rate': sifted_rate * secret_fraction,
+        'detection_probability': stats['detection_probability'],
+        'eve_agreement': stats['eve_agreement'],
+    }
+
+
+def _save_cached(path, row):
+    """Атомарно записывает результат точки в кэш"""
+    temporary = path + '.tmp'
+    with open(temporary, 'w', encoding='utf-8') as file:
+        json.dump(row, file)
+    os.replace(temporary, path)
+
+
+def iter_sweep(grid, trials=100, cache_dir='bb84_sweep_cache', workers=None, seed=0,
+               detection_threshold=QBER_ABORT_THRESHOLD):
+    """
+    Перебирает сетку параметров BB84 и выдает результаты по мере готовности.
+    
+    Точки распределяются по пулу процессов. Каждая готовая точка сохраняется
+    в cache_dir в JSON-файле, имя которого - хеш ее параметров, поэтому
+    прерванный перебор при повторном запуске продолжается с того же места:
+    уже вычисленные точки читаются из кэша.
+    
+    Args:
+        grid: словарь {параметр: список значений} (см. SWEEP_DEFAULTS)
+        trials: количество испытаний Монте-Карло в каждой точке
+        cache_dir: каталог кэша (None - без кэширования)
+        workers: количество процессов (None - по числу ядер, 1 - без пула)
+        seed: начальное значение для воспроизводимости (None - случайные
+            запуски; готовые точки все равно берутся из кэша)
+        detection_threshold: Ева считается обнаруженной, если QBER испытания
+            больше порога (по умолчанию - порог QBER_ABORT_THRESHOLD, чтобы шум
+            канала сам по себе не считался обнаружением)
+    
+    Yields:
+        dict с параметрами точки и полями SWEEP_RESULT_FIELDS
+    """
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+    pending = []
+    for point in sweep_points(grid):
+        key = sweep_point_key(point, trials, seed, detection_threshold)
+        path = os.path.join(cache_dir, key + '.json') if cache_dir is not None else None
+        if path is not None and os.path.exists(path):
+            with open(path, encoding='utf-8') as file:
+                yield json.load(file)
+        else:
+            pending.append((point, key, path))
+    
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_sweep_point, point, trials, key, seed, detection_threshold): path
+                       for point, key, path in pending}
+            for future in as_completed(futures):
+                row = future.result()
+                if futures[future] is not None:
+                    _save_cached(futures[future], row)
+                yield row
+    else:
+        for point, key, path in pending:
+            row = _sweep_point(point, trials, key, seed, detection_threshold)
+            if path is not None:
+                _save_cached(path, row)
+            yield row
+
+
+def sweep(grid, output, trials=100, cache_dir='bb84_sweep_cache', workers=None, seed=0,
+          detection_threshold=QBER_ABORT_THRESHOLD):
+    """
+    Перебирает сетку параметров и построчно записывает результаты в CSV-файл output.
+    
+    Строки записываются по мере готовности точек (порядок может отличаться
+    от порядка сетки). Возвращает количество записанных точек.
+    """
+    fields = list(SWEEP_DEFAULTS) + SWEEP_RESULT_FIELDS
+    count = 0
+    with open(output, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=fields)
+        writer.writeheader()
+        for row in iter_sweep(grid, trials, cache_dir, workers, seed, detection_threshold):
+            writer.writerow(row)
+            file.flush()
+            count += 1
+    return count
+
+
 # Для обратной совместимости старого кода
 def generate_random_bits(length):
     return QuantumBB84().generate_random_bits(length)
@@ -6,7 +6,6 @@ from PyQt6.QtGui import QFont, QColor
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 import numpy as np
-import math
 import sys
 import wave
 
@@ -259,7 +258,7 @@ class WaveGUI(QMainWindow):
         
         # Создаем данные для графика
         x = np.linspace(0, 10, 1000)
-        wave_values = [255 * math.cos(self.z + i * self.dx) for i in range(len(x))]
+        wave_values = wave.wave_vector(self.z, self.dx, len(x))
         
         # Строим график волновой функции
         ax.plot(x, wave_values, 'b-', linewidth=2)
@@ -293,18 +292,14 @@ class WaveGUI(QMainWindow):
         # Заполняем таблицу визуализации процесса шифрования
         self.encryption_table.setRowCount(len(message))
         
+        # Значения волны берутся из того же кэша, что и при шифровании
+        wave_values = wave.wave_vector(self.z, self.dx, len(message))
+        encrypted_values = wave.encrypt_codes([ord(char) for char in message], self.z, self.dx)
+        
         for idx, char in enumerate(message):
             ascii_val = ord(char)
-            wave_val = 255 * math.cos(self.z + idx * self.dx)
-            new_val = ascii_val + wave_val
-            
-            # Нормализуем результат
-            if new_val < 0:
-                new_val += 255
-            elif new_val > 255:
-                new_val -= 255
-            
-            new_val = math.ceil(new_val)
+            wave_val = float(wave_values[idx])
+            new_val = int(encrypted_values[idx])
             hex_val = format(new_val, '02x')
             
             # Записываем данные для визуализации
@@ -344,18 +339,13 @@ class WaveGUI(QMainWindow):
         temp = wave.hex_to_vec(encrypted)
         self.decryption_table.setRowCount(len(temp))
         
+        wave_values = wave.wave_vector(self.z, self.dx, len(temp))
+        decrypted_values = wave.decrypt_codes(temp, self.z, self.dx)
+        
         for idx, num in enumerate(temp):
             hex_val = format(num, '02x')
-            wave_val = 255 * math.cos(self.z + idx * self.dx)
-            new_val = num - wave_val
-            
-            # Нормализуем результат
-            if new_val < 0:
-                new_val += 255
-            elif new_val > 255:
-                new_val -= 255
-                
-            new_val = math.floor(new_val)
+            wave_val = float(wave_values[idx])
+            new_val = int(decrypted_values[idx])
             char = chr(new_val)
             
             # Записываем данные для визуализации
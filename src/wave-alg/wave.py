@@ -1,5 +1,14 @@
 import random
+import argparse
 import math
+import mmap
+import os
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+
+import numpy as np
 
 """
 Реализация алгоритма волнового шифрования (Wave Cipher).
@@ -9,6 +18,23 @@ import math
 Основные параметры шифрования - начальная точка волны (z) и шаг (dx).
 """
 
+def _hex_to_bytes(message):
+    """
+    Быстрый разбор шестнадцатеричной строки через bytes.fromhex().
+    
+    Возвращает None, если строка не состоит строго из пар шестнадцатеричных
+    цифр (нечетная длина, пробелы, знаки и т.п.) - такие строки разбираются
+    посимвольно, чтобы сохранить поведение int(..., 16).
+    """
+    try:
+        data = bytes.fromhex(message)
+    except ValueError:
+        return None
+    # bytes.fromhex() пропускает пробельные символы, int(..., 16) их трактует иначе
+    if 2 * len(data) != len(message):
+        return None
+    return data
+
 def hex_to_vec(message):
     """
     Преобразует шестнадцатеричную строку в список целых чисел.
@@ -22,11 +48,31 @@ def hex_to_vec(message):
     Returns:
         list: Список целых чисел, соответствующих шестнадцатеричным значениям
     """
+    data = _hex_to_bytes(message)
+    if data is not None:
+        return list(data)
     res = []
     for i in range(0, len(message), 2):
         res.append(int(message[i:i+2], 16))
     return res
 
+def _hex_to_codes(message):
+    """Преобразует шестнадцатеричную строку в массив чисел (аналог hex_to_vec())."""
+    data = _hex_to_bytes(message)
+    if data is not None:
+        return np.frombuffer(data, dtype=np.uint8).astype(np.int64)
+    return np.array(hex_to_vec(message), dtype=np.int64)
+
+def _codes_to_hex(values):
+    """
+    Преобразует массив чисел в шестнадцатеричную строку (по format(val, '02x') на число).
+    
+    Если все значения помещаются в байт, строка строится одним вызовом bytes.hex().
+    """
+    if values.size == 0 or (values.min() >= 0 and values.max() <= 255):
+        return values.astype(np.uint8).tobytes().hex()
+    return ''.join([format(val, '02x') for val in values.tolist()])
+
 def f_to(x, z, n, dx):
     """
     Функция шифрования отдельного символа.
@@ -83,52 +129,560 @@ def f_of(x, z, n, dx):
     # Округляем вниз и преобразуем код в символ
     return chr(math.floor(res))
 
-def encrypt(message, z, dx):
+# Кэш таблиц значений волны: (z, dx) -> массив 255 * cos(z + n * dx) для n = 0, 1, ...
+# Таблица для ключа достраивается по мере необходимости, при переполнении
+# вытесняется ключ, который дольше всех не использовался (LRU).
+WAVE_CACHE_SIZE = 32
+WAVE_CACHE_MAX_LENGTH = 1 << 20
+_wave_cache = OrderedDict()
+_wave_cache_lock = threading.Lock()
+
+def _compute_wave(z, dx, length, start=0):
+    """Непосредственно вычисляет значения волны для позиций start..start+length-1."""
+    n = np.arange(start, start + length, dtype=np.float64)
+    return 255 * np.cos(z + n * dx)
+
+def wave_vector(z, dx, length, start=0):
+    """
+    Вычисляет значения волны 255 * cos(z + n * dx) сразу для диапазона позиций.
+    
+    Позиции n пробегают значения start, start + 1, ..., start + length - 1.
+    Для первых WAVE_CACHE_MAX_LENGTH позиций значения берутся из кэша,
+    общего для всех сообщений с теми же ключами (z, dx).
+    
+    Args:
+        z (float): Начальное значение фазы (ключ шифрования)
+        dx (float): Шаг изменения фазы (ключ шифрования)
+        length (int): Количество позиций
+        start (int): Позиция первого элемента в сообщении
+        
+    Returns:
+        numpy.ndarray: Массив значений волны (float64, только для чтения)
+    """
+    end = start + length
+    if end > WAVE_CACHE_MAX_LENGTH or WAVE_CACHE_SIZE <= 0:
+        return _compute_wave(z, dx, length, start)
+    
+    key = (z, dx)
+    with _wave_cache_lock:
+        table = _wave_cache.get(key)
+        if table is not None:
+            _wave_cache.move_to_end(key)
+    
+    if table is None or len(table) < end:
+        # Достраиваем таблицу с запасом, чтобы не пересчитывать ее на каждом сообщении
+        have = 0 if table is None else len(table)
+        new_length = min(max(end, 2 * have, 256), WAVE_CACHE_MAX_LENGTH)
+        tail = _compute_wave(z, dx, new_length - have, have)
+        table = tail if table is None else np.concatenate([table, tail])
+        table.flags.writeable = False
+        with _wave_cache_lock:
+            _wave_cache[key] = table
+            _wave_cache.move_to_end(key)
+            while len(_wave_cache) > WAVE_CACHE_SIZE:
+                _wave_cache.popitem(last=False)
+    
+    return table[start:end]
+
+def clear_wave_cache():
+    """Очищает кэш таблиц значений волны."""
+    with _wave_cache_lock:
+        _wave_cache.clear()
+
+def _normalize(res):
+    """
+    Векторный аналог нормализации из f_to()/f_of(): приводит значения в пределы 0-255.
+    
+    Массив изменяется на месте и возвращается.
+    """
+    res[res < 0] += 255
+    res[res > 255] -= 255
+    return res
+
+def _near_integer(values, eps=1e-9):
+    """
+    Отмечает значения, лежащие вплотную к целому числу.
+    
+    np.cos и math.cos могут расходиться в последнем бите, поэтому в таких
+    точках округление (и выбор ветки нормализации) пересчитывается скалярно.
+    """
+    return np.abs(values - np.rint(values)) < eps
+
+def encrypt_codes(codes, z, dx, start=0):
+    """
+    Векторно шифрует массив кодов символов.
+    
+    Результат совпадает поэлементно с ord(f_to(x, z, n, dx)).
+    
+    Args:
+        codes (array-like): Коды символов исходного сообщения
+        z (float): Начальное значение фазы (ключ шифрования)
+        dx (float): Шаг изменения фазы (ключ шифрования)
+        start (int): Позиция первого кода в сообщении
+        
+    Returns:
+        numpy.ndarray: Коды зашифрованных символов (int64)
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    res = codes + wave_vector(z, dx, len(codes), start)
+    # Проверка до нормализации: она выполняется на месте
+    near = _near_integer(res)
+    _normalize(res)
+    near |= _near_integer(res)
+    out = np.ceil(res).astype(np.int64)
+    for i in np.flatnonzero(near):
+        out[i] = ord(f_to(int(codes[i]), z, start + int(i), dx))
+    return out
+
+def decrypt_codes(codes, z, dx, start=0):
+    """
+    Векторно дешифрует массив зашифрованных кодов.
+    
+    Результат совпадает поэлементно с ord(f_of(x, z, n, dx)).
+    
+    Args:
+        codes (array-like): Коды зашифрованных символов
+        z (float): Начальное значение фазы (ключ дешифрования)
+        dx (float): Шаг изменения фазы (ключ дешифрования)
+        start (int): Позиция первого кода в сообщении
+        
+    Returns:
+        numpy.ndarray: Коды дешифрованных символов (int64)
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    res = codes - wave_vector(z, dx, len(codes), start)
+    # Проверка до нормализации: она выполняется на месте
+    near = _near_integer(res)
+    _normalize(res)
+    near |= _near_integer(res)
+    out = np.floor(res).astype(np.int64)
+    for i in np.flatnonzero(near):
+        out[i] = ord(f_of(int(codes[i]), z, start + int(i), dx))
+    return out
+
+def _str_to_codes(message):
+    """Преобразует строку в массив кодов символов без посимвольного вызова ord()."""
+    return np.frombuffer(message.encode('utf-32-le', 'surrogatepass'), dtype='<u4').astype(np.int64)
+
+def encrypt(message, z, dx, output='hex'):
     """
     Шифрует текстовое сообщение с использованием волнового алгоритма.
     
-    Для каждого символа применяется функция шифрования f_to().
-    Результат конвертируется в шестнадцатеричное представление.
+    Функция шифрования f_to() применяется ко всему сообщению сразу
+    в векторной форме (см. encrypt_codes()).
+    Результат конвертируется в шестнадцатеричное представление
+    или, при output='raw', возвращается байтами без шага hex-кодирования.
     
     Args:
         message (str): Исходное текстовое сообщение
         z (float): Начальное значение фазы (ключ шифрования)
         dx (float): Шаг изменения фазы (ключ шифрования)
+        output (str): Формат результата: 'hex' или 'raw'
         
     Returns:
-        str: Зашифрованное сообщение в шестнадцатеричном формате
+        str | bytes: Зашифрованное сообщение в шестнадцатеричном формате (или байтами)
+        
+    Raises:
+        ValueError: Неизвестный формат или символы, не помещающиеся в байт, при output='raw'
     """
-    res = ""
-    for idx, char in enumerate(message):
-        # Шифруем каждый символ и преобразуем результат в шестнадцатеричную строку
-        val = f_to(ord(char), z, idx, dx)
-        res += format(ord(val), '02x')
-    return res
+    values = encrypt_codes(_str_to_codes(message), z, dx)
+    if output == 'hex':
+        return _codes_to_hex(values)
+    if output == 'raw':
+        if values.size and (values.min() < 0 or values.max() > 255):
+            raise ValueError("Зашифрованные значения не помещаются в байт, используйте output='hex'")
+        return values.astype(np.uint8).tobytes()
+    raise ValueError(f"Неизвестный формат результата: {output}")
 
 def decrypt(enc_message, z, dx):
     """
     Дешифрует зашифрованное сообщение.
     
     Сначала преобразует шестнадцатеричную строку в числа,
-    затем для каждого числа применяет функцию дешифрования f_of().
+    затем применяет функцию дешифрования f_of() ко всем числам
+    в векторной форме (см. decrypt_codes()).
+    Сообщение в двоичном виде (результат encrypt(..., output='raw'))
+    используется напрямую, без шага hex-декодирования.
     
     Args:
-        enc_message (str): Зашифрованное сообщение в шестнадцатеричном формате
+        enc_message (str | bytes-like): Зашифрованное сообщение в шестнадцатеричном формате или байтами
         z (float): Начальное значение фазы (ключ дешифрования)
         dx (float): Шаг изменения фазы (ключ дешифрования)
         
     Returns:
         str: Дешифрованное текстовое сообщение
     """
-    res = ""
-    # Преобразуем шестнадцатеричную строку в список чисел
-    temp = hex_to_vec(enc_message)
-    for idx, num in enumerate(temp):
-        # Дешифруем каждое число и добавляем результирующий символ к выходной строке
-        res += f_of(num, z, idx, dx)
-    return res
+    if isinstance(enc_message, str):
+        # Преобразуем шестнадцатеричную строку в массив чисел
+        temp = _hex_to_codes(enc_message)
+    else:
+        temp = np.frombuffer(enc_message, dtype=np.uint8)
+    return ''.join(map(chr, decrypt_codes(temp, z, dx).tolist()))
+
+def _output_view(data_len, out):
+    """
+    Подготавливает буфер результата для encrypt_bytes()/decrypt_bytes().
+    
+    Если out не задан, выделяется новый bytearray нужной длины.
+    Возвращает сам буфер и его представление в виде массива uint8.
+    """
+    if out is None:
+        out = bytearray(data_len)
+    view = np.frombuffer(out, dtype=np.uint8)
+    if view.size != data_len:
+        raise ValueError(f"Размер выходного буфера ({view.size}) не совпадает с размером входных данных ({data_len})")
+    if not view.flags.writeable:
+        raise ValueError("Выходной буфер доступен только для чтения")
+    return out, view
+
+def byte_keystream(z, dx, length, start=0):
+    """
+    Вычисляет байты гаммы floor(255 * cos(z + n * dx)) mod 256 для двоичного режима.
+    
+    Как и в encrypt_codes(), значения вплотную к целому числу пересчитываются
+    скалярно через math.cos, чтобы гамма не зависела от реализации np.cos.
+    
+    Args:
+        z (float): Начальное значение фазы (ключ)
+        dx (float): Шаг изменения фазы (ключ)
+        length (int): Количество байтов
+        start (int): Позиция первого байта в сообщении
+        
+    Returns:
+        numpy.ndarray: Байты гаммы (uint8)
+    """
+    wave = wave_vector(z, dx, length, start)
+    keys = np.floor(wave).astype(np.int64)
+    for i in np.flatnonzero(_near_integer(wave)):
+        keys[i] = math.floor(255 * math.cos(z + (start + int(i)) * dx))
+    return (keys & 0xFF).astype(np.uint8)
+
+def encrypt_bytes(data, z, dx, out=None, start=0):
+    """
+    Шифрует двоичные данные с использованием волнового алгоритма.
+    
+    В отличие от encrypt() волна накладывается по модулю 256:
+    c = (x + floor(255 * cos(z + n * dx))) mod 256. Так преобразование
+    обратимо для любого байта (в текстовом режиме с нормализацией по 255
+    байты 0 и 255 неразличимы), но результат не совпадает с encrypt()
+    для символов с теми же кодами - форматы несовместимы.
+    
+    Args:
+        data (bytes-like): Исходные данные (bytes, bytearray, memoryview и т.п.)
+        z (float): Начальное значение фазы (ключ шифрования)
+        dx (float): Шаг изменения фазы (ключ шифрования)
+        out (bytes-like, optional): Записываемый буфер той же длины для результата
+        start (int): Позиция первого байта в сообщении
+        
+    Returns:
+        bytearray: Зашифрованные данные (или переданный буфер out)
+    """
+    src = np.frombuffer(data, dtype=np.uint8)
+    out, view = _output_view(src.size, out)
+    # Сложение uint8 выполняется по модулю 256
+    np.add(src, byte_keystream(z, dx, src.size, start), out=view)
+    return out
+
+def decrypt_bytes(data, z, dx, out=None, start=0):
+    """
+    Дешифрует двоичные данные, зашифрованные функцией encrypt_bytes().
+    
+    Args:
+        data (bytes-like): Зашифрованные данные
+        z (float): Начальное значение фазы (ключ дешифрования)
+        dx (float): Шаг изменения фазы (ключ дешифрования)
+        out (bytes-like, optional): Записываемый буфер той же длины для результата
+        start (int): Позиция первого байта в сообщении
+        
+    Returns:
+        bytearray: Дешифрованные данные (или переданный буфер out)
+    """
+    src = np.frombuffer(data, dtype=np.uint8)
+    out, view = _output_view(src.size, out)
+    np.subtract(src, byte_keystream(z, dx, src.size, start), out=view)
+    return out
+
+# Размер сегмента (в байтах) по умолчанию для параллельной обработки
+PARALLEL_CHUNK_SIZE = 1 << 22
+
+def _transform_parallel(transform, data, z, dx, out, workers, chunk_size, start):
+    """
+    Разбивает данные на сегменты с известным смещением и обрабатывает их в пуле потоков.
+    
+    Каждый сегмент зависит только от z, dx и своей позиции, поэтому сегменты
+    независимы; результат каждого записывается прямо в свой участок out.
+    Векторные операции NumPy над большими массивами отпускают GIL,
+    так что потоки действительно выполняются параллельно.
+    """
+    if chunk_size <= 0:
+        raise ValueError("Размер сегмента должен быть положительным")
+    src = np.frombuffer(data, dtype=np.uint8)
+    out, view = _output_view(src.size, out)
+    segments = [(pos, min(pos + chunk_size, src.size)) for pos in range(0, src.size, chunk_size)]
+    
+    def run(segment):
+        begin, end = segment
+        transform(src[begin:end], z, dx, out=view[begin:end], start=start + begin)
+    
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(segments) <= 1:
+        for segment in segments:
+            run(segment)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # list() дожидается всех сегментов и пробрасывает исключения
+            list(pool.map(run, segments))
+    return out
+
+def encrypt_bytes_parallel(data, z, dx, out=None, workers=None, chunk_size=PARALLEL_CHUNK_SIZE, start=0):
+    """
+    Многопоточный вариант encrypt_bytes() для больших объемов данных.
+    
+    Args:
+        data (bytes-like): Исходные данные
+        z (float): Начальное значение фазы (ключ шифрования)
+        dx (float): Шаг изменения фазы (ключ шифрования)
+        out (bytes-like, optional): Записываемый буфер той же длины для результата
+        workers (int, optional): Количество потоков (по умолчанию - число ядер)
+        chunk_size (int): Размер сегмента в байтах
+        start (int): Позиция первого байта в сообщении
+        
+    Returns:
+        bytearray: Зашифрованные данные (или переданный буфер out)
+    """
+    return _transform_parallel(encrypt_bytes, data, z, dx, out, workers, chunk_size, start)
+
+def decrypt_bytes_parallel(data, z, dx, out=None, workers=None, chunk_size=PARALLEL_CHUNK_SIZE, start=0):
+    """
+    Многопоточный вариант decrypt_bytes() для больших объемов данных.
+    
+    Args:
+        data (bytes-like): Зашифрованные данные
+        z (float): Начальное значение фазы (ключ дешифрования)
+        dx (float): Шаг изменения фазы (ключ дешифрования)
+        out (bytes-like, optional): Записываемый буфер той же длины для результата
+        workers (int, optional): Количество потоков (по умолчанию - число ядер)
+        chunk_size (int): Размер сегмента в байтах
+        start (int): Позиция первого байта в сообщении
+        
+    Returns:
+        bytearray: Дешифрованные данные (или переданный буфер out)
+    """
+    return _transform_parallel(decrypt_bytes, data, z, dx, out, workers, chunk_size, start)
+
+class WaveStream(ABC):
+    """
+    Базовый класс потокового шифрования/дешифрования волновым алгоритмом.
+    
+    Хранит ключи z, dx и текущую позицию в сообщении, поэтому сообщение
+    можно обрабатывать частями произвольного размера: результат совпадает
+    с однократным вызовом encrypt()/decrypt() (или encrypt_bytes()/decrypt_bytes()).
+    
+    Части могут быть строками (str) или двоичными данными (bytes-like);
+    двоичные части обрабатываются в режиме по модулю 256 (см. encrypt_bytes()),
+    поэтому смешивать строки и байты в одном потоке не следует.
+    """
+    
+    def __init__(self, z, dx, offset=0):
+        """Инициализация ключами и начальной позицией в сообщении"""
+        self.z = z
+        self.dx = dx
+        self.offset = offset
+        self.finished = False
+    
+    @abstractmethod
+    def _transform_bytes(self, data):
+        """Обрабатывает двоичную часть сообщения"""
+    
+    @abstractmethod
+    def _transform_str(self, chunk):
+        """Обрабатывает строковую часть сообщения"""
+    
+    def update(self, chunk):
+        """Обрабатывает очередную часть сообщения и возвращает результат для нее"""
+        if self.finished:
+            raise ValueError("Поток уже завершен вызовом finalize()")
+        if isinstance(chunk, str):
+            return self._transform_str(chunk)
+        return self._transform_bytes(chunk)
+    
+    def finalize(self):
+        """Завершает поток и возвращает оставшийся результат (если он есть)"""
+        self.finished = True
+        return ""
+
+
+class WaveEncryptor(WaveStream):
+    """Потоковый шифратор: str -> hex-строка, bytes-like -> bytearray"""
+    
+    def _transform_bytes(self, data):
+        res = encrypt_bytes(data, self.z, self.dx, start=self.offset)
+        self.offset += len(res)
+        return res
+    
+    def _transform_str(self, chunk):
+        values = encrypt_codes(_str_to_codes(chunk), self.z, self.dx, self.offset)
+        self.offset += len(values)
+        return _codes_to_hex(values)
+
+
+class WaveDecryptor(WaveStream):
+    """Потоковый дешифратор: hex-строка -> str, bytes-like -> bytearray"""
+    
+    def __init__(self, z, dx, offset=0):
+        super().__init__(z, dx, offset)
+        # Непарная шестнадцатеричная цифра, оставшаяся с конца предыдущей части
+        self.pending_hex = ""
+    
+    def _transform_bytes(self, data):
+        res = decrypt_bytes(data, self.z, self.dx, start=self.offset)
+        self.offset += len(res)
+        return res
+    
+    def _decrypt_hex(self, hex_part):
+        temp = _hex_to_codes(hex_part)
+        values = decrypt_codes(temp, self.z, self.dx, self.offset)
+        self.offset += len(values)
+        return ''.join(map(chr, values.tolist()))
+    
+    def _transform_str(self, chunk):
+        chunk = self.pending_hex + chunk
+        split = len(chunk) - len(chunk) % 2
+        self.pending_hex = chunk[split:]
+        return self._decrypt_hex(chunk[:split])
+    
+    def finalize(self):
+        # Как и hex_to_vec(), последнюю одиночную цифру считаем отдельным числом
+        tail = self._decrypt_hex(self.pending_hex) if self.pending_hex else ""
+        self.pending_hex = ""
+        super().finalize()
+        return tail
+
+
+def iter_encrypt(chunks, z, dx):
+    """
+    Шифрует поток частей сообщения, выдавая зашифрованные части по мере поступления.
+    
+    Например, файл можно зашифровать с постоянным расходом памяти:
+    iter_encrypt(iter(lambda: f.read(1 << 20), b''), z, dx)
+    
+    Args:
+        chunks (iterable): Части сообщения (str или bytes-like)
+        z (float): Начальное значение фазы (ключ шифрования)
+        dx (float): Шаг изменения фазы (ключ шифрования)
+        
+    Yields:
+        str | bytearray: Зашифрованные части
+    """
+    encryptor = WaveEncryptor(z, dx)
+    for chunk in chunks:
+        yield encryptor.update(chunk)
+    tail = encryptor.finalize()
+    if tail:
+        yield tail
+
+def iter_decrypt(chunks, z, dx):
+    """
+    Дешифрует поток частей зашифрованного сообщения (см. iter_encrypt()).
+    
+    Args:
+        chunks (iterable): Части зашифрованного сообщения (hex-строки или bytes-like)
+        z (float): Начальное значение фазы (ключ дешифрования)
+        dx (float): Шаг изменения фазы (ключ дешифрования)
+        
+    Yields:
+        str | bytearray: Дешифрованные части
+    """
+    decryptor = WaveDecryptor(z, dx)
+    for chunk in chunks:
+        yield decryptor.update(chunk)
+    tail = decryptor.finalize()
+    if tail:
+        yield tail
+
+# Размер блока (в байтах) по умолчанию при шифровании файлов
+FILE_BLOCK_SIZE = 1 << 26
+
+def _transform_file(transform, src, dst, z, dx, block_size, workers):
+    """
+    Отображает входной и выходной файлы в память и обрабатывает их поблочно.
+    
+    Данные не копируются в строки Python: каждый блок читается из отображения
+    входного файла и записывается прямо в отображение выходного файла.
+    Если dst не задан или совпадает с src, файл обрабатывается на месте.
+    """
+    if block_size <= 0:
+        raise ValueError("Размер блока должен быть положительным")
+    in_place = dst is None or (os.path.exists(dst) and os.path.samefile(src, dst))
+    size = os.path.getsize(src)
+    
+    with open(src, 'r+b' if in_place else 'rb') as fin:
+        if in_place:
+            fout = fin
+        else:
+            fout = open(dst, 'w+b')
+        try:
+            if size == 0:
+                return 0
+            fout.truncate(size)
+            if in_place:
+                src_map = dst_map = mmap.mmap(fin.fileno(), size)
+            else:
+                src_map = mmap.mmap(fin.fileno(), size, access=mmap.ACCESS_READ)
+                dst_map = mmap.mmap(fout.fileno(), size)
+            try:
+                with memoryview(src_map) as src_view, memoryview(dst_map) as dst_view:
+                    for pos in range(0, size, block_size):
+                        end = min(pos + block_size, size)
+                        transform(src_view[pos:end], z, dx, out=dst_view[pos:end],
+                                  workers=workers, start=pos)
+                dst_map.flush()
+            finally:
+                dst_map.close()
+                if src_map is not dst_map:
+                    src_map.close()
+        finally:
+            if fout is not fin:
+                fout.close()
+    return size
 
-def main():
+def encrypt_file(src, dst, z, dx, block_size=FILE_BLOCK_SIZE, workers=None):
+    """
+    Шифрует файл волновым алгоритмом через отображение в память (mmap).
+    
+    Каждый байт файла шифруется так же, как в encrypt_bytes().
+    
+    Args:
+        src (str): Путь к исходному файлу
+        dst (str | None): Путь к зашифрованному файлу (None - шифровать на месте)
+        z (float): Начальное значение фазы (ключ шифрования)
+        dx (float): Шаг изменения фазы (ключ шифрования)
+        block_size (int): Размер обрабатываемого за раз блока в байтах
+        workers (int, optional): Количество потоков для обработки блока
+        
+    Returns:
+        int: Количество обработанных байтов
+    """
+    return _transform_file(encrypt_bytes_parallel, src, dst, z, dx, block_size, workers)
+
+def decrypt_file(src, dst, z, dx, block_size=FILE_BLOCK_SIZE, workers=None):
+    """
+    Дешифрует файл, зашифрованный функцией encrypt_file().
+    
+    Args:
+        src (str): Путь к зашифрованному файлу
+        dst (str | None): Путь к дешифрованному файлу (None - дешифровать на месте)
+        z (float): Начальное значение фазы (ключ дешифрования)
+        dx (float): Шаг изменения фазы (ключ дешифрования)
+        block_size (int): Размер обрабатываемого за раз блока в байтах
+        workers (int, optional): Количество потоков для обработки блока
+        
+    Returns:
+        int: Количество обработанных байтов
+    """
+    return _transform_file(decrypt_bytes_parallel, src, dst, z, dx, block_size, workers)
+
+def demo():
     """
     Демонстрирует работу алгоритма волнового шифрования.
     
@@ -147,7 +701,7 @@ def main():
     dec_message = decrypt(enc_message, z, dx)
     
     # Преобразуем зашифрованное сообщение в читаемый вид
-    enc_readable = ''.join([chr(int(enc_message[i:i+2], 16)) for i in range(0, len(enc_message), 2)])
+    enc_readable = ''.join(map(chr, _hex_to_codes(enc_message).tolist()))
     
     # Выводим результаты
     print("Зашифрованное сообщение (в читаемом виде):")
@@ -155,5 +709,43 @@ def main():
     print("\nРасшифрованное сообщение:")
     print(dec_message)
 
+def main(argv=None):
+    """
+    Точка входа командной строки.
+    
+    Без аргументов запускает демонстрацию (demo()), с командами
+    encrypt/decrypt шифрует или дешифрует файл:
+    
+        python wave.py encrypt SRC DST --z Z --dx DX
+        python wave.py decrypt SRC DST --z Z --dx DX
+    
+    Вместо DST можно указать --in-place, чтобы обработать файл на месте.
+    """
+    parser = argparse.ArgumentParser(description="Волновой алгоритм шифрования")
+    subparsers = parser.add_subparsers(dest="command")
+    for command, help_text in (("encrypt", "Зашифровать файл"), ("decrypt", "Дешифровать файл")):
+        sub = subparsers.add_parser(command, help=help_text)
+        sub.add_argument("src", help="Входной файл")
+        sub.add_argument("dst", nargs="?", help="Выходной файл")
+        sub.add_argument("--in-place", action="store_true", help="Обработать входной файл на месте")
+        sub.add_argument("--z", type=float, required=True, help="Начальная фаза волны")
+        sub.add_argument("--dx", type=float, required=True, help="Шаг изменения фазы")
+        sub.add_argument("--block-size", type=int, default=FILE_BLOCK_SIZE, help="Размер блока в байтах")
+        sub.add_argument("--workers", type=int, default=None, help="Количество потоков")
+    args = parser.parse_args(argv)
+    
+    if args.command is None:
+        demo()
+        return
+    
+    # Обработка на месте перезаписывает исходный файл, поэтому требует явного флага
+    if (args.dst is None) == (not args.in_place):
+        parser.error("укажите либо выходной файл DST, либо --in-place")
+    
+    transform_file = encrypt_file if args.command == "encrypt" else decrypt_file
+    size = transform_file(args.src, args.dst, args.z, args.dx,
+                          block_size=args.block_size, workers=args.workers)
+    print(f"Обработано байтов: {size}")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,165 @@
+"""
+Тесты упакованного формата шифротекста и потокового шифрования рюкзачного алгоритма.
+"""
+import importlib.util
+import io
+import pathlib
+import random
+
+import pytest
+
+KNAPSACK_PATH = pathlib.Path(__file__).resolve().parents[1] / 'src' / 'knapsack' / 'knapsack.py'
+
+_spec = importlib.util.spec_from_file_location('knapsack', KNAPSACK_PATH)
+knapsack = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(knapsack)
+
+# Смещения полей заголовка: сигнатура (4), версия, режим, ширина
+VERSION_OFFSET, MODE_OFFSET, WIDTH_OFFSET = 4, 5, 6
+
+
+@pytest.fixture(scope='module')
+def keys():
+    random.seed(1)
+    return knapsack.generate_keys(8)
+
+
+@pytest.fixture(scope='module')
+def block_keys():
+    random.seed(2)
+    return knapsack.generate_keys(32)
+
+
+def corrupt(data, offset, value):
+    data = bytearray(data)
+    data[offset] = value
+    return bytes(data)
+
+
+def test_chars_round_trip(keys):
+    private_key, public_key, n, m = keys
+    values, _ = knapsack.encrypt_message('hello world', public_key, details=False)
+    packed = knapsack.pack_ciphertext(values, public_key)
+    assert knapsack.decrypt_message(packed, private_key, n, m, details=False)[0] == 'hello world'
+    assert knapsack.decrypt_message(memoryview(packed), private_key, n, m)[0] == 'hello world'
+    # Значения из unpack_ciphertext - memoryview другого формата, а не контейнер
+    unpacked = knapsack.unpack_ciphertext(packed)
+    assert list(unpacked.values) == values
+    assert knapsack.decrypt_message(unpacked.values, private_key, n, m, details=False)[0] == 'hello world'
+
+
+def test_blocks_round_trip(block_keys):
+    private_key, public_key, n, m = block_keys
+    data = bytes(range(256)) + b'tail'
+    values = knapsack.encrypt_blocks(data, public_key)
+    packed = knapsack.pack_ciphertext(values, public_key, knapsack.MODE_BLOCKS, len(data))
+    assert knapsack.decrypt_blocks(packed, private_key, n, m) == data
+
+
+def test_truncated_chars_are_rejected(keys):
+    private_key, public_key, n, m = keys
+    values, _ = knapsack.encrypt_message('hello world', public_key, details=False)
+    packed = knapsack.pack_ciphertext(values, public_key)
+    width = knapsack.value_width(public_key)
+    with pytest.raises(ValueError):
+        knapsack.decrypt_message(packed[:-width], private_key, n, m)
+    with pytest.raises(ValueError):
+        knapsack.decrypt_message(packed[:-1], private_key, n, m)
+    with pytest.raises(ValueError):
+        knapsack.decrypt_message(packed[:10], private_key, n, m)
+
+
+def test_truncated_blocks_are_rejected(block_keys):
+    private_key, public_key, n, m = block_keys
+    values = knapsack.encrypt_blocks(b'hello world', public_key)
+    packed = knapsack.pack_ciphertext(values, public_key, knapsack.MODE_BLOCKS, 11)
+    with pytest.raises(ValueError):
+        knapsack.decrypt_blocks(packed[:-knapsack.value_width(public_key)], private_key, n, m)
+
+
+@pytest.mark.parametrize('offset, value', [
+    (0, ord('X')),               # сигнатура
+    (VERSION_OFFSET, 99),        # версия
+    (MODE_OFFSET, 7),            # неизвестный режим
+    (MODE_OFFSET, knapsack.MODE_BLOCKS),
+    (WIDTH_OFFSET, 0),           # нулевая ширина
+    (WIDTH_OFFSET, 3),           # ширина не соответствует ключу
+])
+def test_corrupt_header_is_rejected(keys, offset, value):
+    private_key, public_key, n, m = keys
+    values, _ = knapsack.encrypt_message('abcdef', public_key, details=False)
+    packed = corrupt(knapsack.pack_ciphertext(values, public_key), offset, value)
+    with pytest.raises(ValueError):
+        knapsack.decrypt_message(packed, private_key, n, m)
+
+
+@pytest.mark.parametrize('offset, value', [(MODE_OFFSET, 7), (WIDTH_OFFSET, 0)])
+def test_unpack_rejects_corrupt_header(keys, offset, value):
+    _, public_key, _, _ = keys
+    packed = corrupt(knapsack.pack_ciphertext([1, 2, 3], public_key), offset, value)
+    with pytest.raises(ValueError):
+        knapsack.unpack_ciphertext(packed)
+
+
+def test_other_key_is_rejected(keys, block_keys):
+    private_key, public_key, n, m = keys
+    values, _ = knapsack.encrypt_message('abc', public_key, details=False)
+    packed = knapsack.pack_ciphertext(values, public_key)
+    other_private, _, other_n, other_m = block_keys
+    with pytest.raises(ValueError):
+        knapsack.decrypt_message(packed, other_private, other_n, other_m)
+
+
+class Unseekable(io.BytesIO):
+    """Выходной канал без перемещения (как pipe)"""
+
+    def seekable(self):
+        return False
+
+
+def encrypt_to_bytes(data, public_key, chunk_size=7):
+    dst = io.BytesIO()
+    knapsack.encrypt_stream(io.BytesIO(data), dst, public_key, chunk_size=chunk_size)
+    return dst.getvalue()
+
+
+def decrypt_from_bytes(packed, private_key, n, m, chunk_size=5):
+    dst = io.BytesIO()
+    knapsack.decrypt_stream(io.BytesIO(packed), dst, private_key, n, m, chunk_size=chunk_size)
+    return dst.getvalue()
+
+
+def test_stream_round_trip(keys):
+    private_key, public_key, n, m = keys
+    data = bytes(range(256)) * 3
+    packed = encrypt_to_bytes(data, public_key)
+    assert knapsack.unpack_ciphertext(packed).length == len(data)
+    # Части произвольного размера, в том числе рвущие заголовок и значения
+    for chunk_size in (1, 3, 25, 1 << 16):
+        assert decrypt_from_bytes(packed, private_key, n, m, chunk_size) == data
+
+
+def test_stream_without_length_round_trip(keys):
+    private_key, public_key, n, m = keys
+    dst = Unseekable()
+    knapsack.encrypt_stream(io.BytesIO(b'hello world'), dst, public_key)
+    packed = dst.getvalue()
+    assert knapsack.unpack_ciphertext(packed).length == 0
+    assert decrypt_from_bytes(packed, private_key, n, m) == b'hello world'
+
+
+def test_truncated_stream_is_rejected(keys):
+    private_key, public_key, n, m = keys
+    packed = encrypt_to_bytes(b'hello world', public_key)
+    width = knapsack.value_width(public_key)
+    for truncated in (packed[:-3 * width], packed[:-1], packed[:10]):
+        with pytest.raises(ValueError):
+            decrypt_from_bytes(truncated, private_key, n, m)
+
+
+@pytest.mark.parametrize('offset, value', [(MODE_OFFSET, 7), (WIDTH_OFFSET, 0), (WIDTH_OFFSET, 3)])
+def test_stream_corrupt_header_is_rejected(keys, offset, value):
+    private_key, public_key, n, m = keys
+    packed = corrupt(encrypt_to_bytes(b'hello world', public_key), offset, value)
+    with pytest.raises(ValueError):
+        decrypt_from_bytes(packed, private_key, n, m)
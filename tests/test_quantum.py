@@ -0,0 +1,118 @@
+"""
+Тесты векторной симуляции BB84: согласование ключей, усиление секретности и перебор параметров.
+"""
+import importlib.util
+import pathlib
+
+import numpy as np
+import pytest
+
+QUANTUM_PATH = pathlib.Path(__file__).resolve().parents[1] / 'src' / 'quantum' / 'quantum.py'
+
+_spec = importlib.util.spec_from_file_location('quantum', QUANTUM_PATH)
+quantum = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(quantum)
+
+
+def noisy_keys(rng, length, error_rate):
+    alice = rng.integers(0, 2, length, dtype=np.uint8)
+    bob = alice.copy()
+    bob[rng.random(length) < error_rate] ^= 1
+    return alice, bob
+
+
+@pytest.mark.parametrize('length, error_rate', [(1000, 0.01), (20000, 0.03), (20000, 0.11), (5000, 0.25)])
+def test_cascade_leaves_no_errors(length, error_rate):
+    rng = np.random.default_rng(length)
+    alice, bob = noisy_keys(rng, length, error_rate)
+    corrected, leaked = quantum.cascade_reconcile(alice, bob, error_rate, rng=rng)
+    assert np.array_equal(corrected, alice)
+    assert leaked > 0
+
+
+def test_cascade_with_zero_error_estimate():
+    # Оценка QBER по выборке может быть нулевой, хотя в ключе есть ошибки
+    rng = np.random.default_rng(7)
+    for _ in range(50):
+        alice = rng.integers(0, 2, 1000, dtype=np.uint8)
+        bob = alice.copy()
+        bob[rng.choice(1000, 2, replace=False)] ^= 1
+        corrected, _ = quantum.cascade_reconcile(alice, bob, 0, rng=rng)
+        assert np.array_equal(corrected, alice)
+
+
+def test_cascade_with_secrets_generator():
+    rng = np.random.default_rng(8)
+    alice, bob = noisy_keys(rng, 5000, 0.05)
+    corrected, _ = quantum.cascade_reconcile(alice, bob, 0.05, rng=quantum.SecretsGenerator())
+    assert np.array_equal(corrected, alice)
+
+
+def test_cascade_empty_key():
+    empty = np.zeros(0, dtype=np.uint8)
+    corrected, leaked = quantum.cascade_reconcile(empty, empty, 0.1)
+    assert len(corrected) == 0 and leaked == 0
+
+
+def naive_toeplitz(key, seed_bits, output_length):
+    """Прямое произведение матрицы Тёплица T[i][j] = seed[i - j + n - 1] на ключ над GF(2)"""
+    n = len(key)
+    matrix = np.array([[seed_bits[i - j + n - 1] for j in range(n)] for i in range(output_length)], dtype=np.int64)
+    return (matrix @ np.asarray(key, dtype=np.int64)) % 2
+
+
+@pytest.mark.parametrize('length, output_length', [(1, 1), (7, 3), (64, 1), (1, 64), (65, 64), (300, 299), (513, 100)])
+def test_toeplitz_hash_matches_matrix_product(length, output_length):
+    rng = np.random.default_rng(length * 1000 + output_length)
+    key = rng.integers(0, 2, length, dtype=np.uint8)
+    seed_bits = rng.integers(0, 2, length + output_length - 1, dtype=np.uint8)
+    assert quantum.toeplitz_hash(key, seed_bits, output_length).tolist() == \
+        naive_toeplitz(key, seed_bits, output_length).tolist()
+
+
+def test_toeplitz_hash_rejects_wrong_seed_length():
+    with pytest.raises(ValueError):
+        quantum.toeplitz_hash(np.ones(10, dtype=np.uint8), np.ones(5, dtype=np.uint8), 4)
+
+
+def test_privacy_amplification_length_and_agreement():
+    rng = np.random.default_rng(9)
+    alice, bob = noisy_keys(rng, 20000, 0.03)
+    corrected, leaked = quantum.cascade_reconcile(alice, bob, 0.03, rng=rng)
+    final_alice, seed_bits = quantum.privacy_amplification(alice, 0.03, leaked, rng=rng)
+    assert len(final_alice) == quantum.secure_key_length(len(alice), 0.03, leaked)
+    assert np.array_equal(quantum.toeplitz_hash(corrected, seed_bits, len(final_alice)), final_alice)
+
+
+def test_privacy_amplification_discards_insecure_key():
+    rng = np.random.default_rng(10)
+    key = rng.integers(0, 2, 1000, dtype=np.uint8)
+    # Утечка при согласовании не меньше n * h(e), и при QBER 25% секретных битов не остается
+    leaked = int(len(key) * quantum.binary_entropy(0.25))
+    final_key, _ = quantum.privacy_amplification(key, 0.25, leaked, rng=rng)
+    assert len(final_key) == 0
+
+
+SWEEP_GRID = {'length': [2000], 'intercept_probability': [0, 1], 'noise': [0, 0.05]}
+
+
+def test_sweep_without_seed():
+    rows = list(quantum.iter_sweep(SWEEP_GRID, trials=5, cache_dir=None, workers=1, seed=None))
+    assert len(rows) == 4
+
+
+def test_sweep_noise_alone_is_not_detection():
+    rows = quantum.iter_sweep(SWEEP_GRID, trials=10, cache_dir=None, workers=1)
+    detection = {(row['intercept_probability'], row['noise']): row['detection_probability'] for row in rows}
+    assert detection[(0, 0.05)] == 0.0
+    assert detection[(1, 0)] == 1.0
+
+
+def test_sweep_resumes_from_cache(tmp_path):
+    cache_dir = tmp_path / 'cache'
+    first = tmp_path / 'first.csv'
+    second = tmp_path / 'second.csv'
+    assert quantum.sweep(SWEEP_GRID, str(first), trials=5, cache_dir=str(cache_dir), workers=1) == 4
+    assert len(list(cache_dir.glob('*.json'))) == 4
+    assert quantum.sweep(SWEEP_GRID, str(second), trials=5, cache_dir=str(cache_dir), workers=1) == 4
+    assert sorted(first.read_text().splitlines()) == sorted(second.read_text().splitlines())
@@ -0,0 +1,149 @@
+"""
+Регрессионные тесты векторного волнового шифрования.
+
+Векторные encrypt/decrypt и encrypt_codes/decrypt_codes должны совпадать
+поэлементно со скалярными f_to()/f_of() - в том числе в точках, где значение
+лежит вплотную к целому числу и результат пересчитывается скалярно.
+"""
+import importlib.util
+import math
+import pathlib
+import random
+
+import numpy as np
+import pytest
+
+WAVE_PATH = pathlib.Path(__file__).resolve().parents[1] / 'src' / 'wave-alg' / 'wave.py'
+
+# Модуль загружается по пути: каталог wave-alg не является пакетом,
+# а имя wave занято стандартной библиотекой
+_spec = importlib.util.spec_from_file_location('wave_alg', WAVE_PATH)
+wave = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(wave)
+
+
+def random_keys(rng, count):
+    """Случайные пары (z, dx): целые, дробные и нулевые"""
+    keys = [(0, 0), (0, 1), (1, 0)]
+    for i in range(count):
+        if i % 2:
+            keys.append((rng.randint(-500, 500), rng.randint(-500, 500)))
+        else:
+            keys.append((rng.uniform(-10, 10), rng.uniform(-10, 10)))
+    return keys
+
+
+def reference_encrypt(message, z, dx):
+    return ''.join(format(ord(wave.f_to(ord(char), z, idx, dx)), '02x') for idx, char in enumerate(message))
+
+
+def reference_decrypt(enc_message, z, dx):
+    return ''.join(wave.f_of(num, z, idx, dx) for idx, num in enumerate(wave.hex_to_vec(enc_message)))
+
+
+def outcome(func, *args):
+    """Результат вызова или тип исключения (скалярные функции падают на chr() от отрицательного кода)"""
+    try:
+        return func(*args)
+    except ValueError as error:
+        return type(error)
+
+
+@pytest.mark.parametrize('z, dx', random_keys(random.Random(1), 40))
+def test_codes_match_scalar_functions(z, dx):
+    rng = random.Random(f'{z}:{dx}')
+    # Коды больше 255 - символы за пределами Latin-1
+    codes = [rng.randint(0, 3000) for _ in range(200)]
+    start = rng.randint(0, 100)
+
+    encrypted = wave.encrypt_codes(codes, z, dx, start).tolist()
+    assert encrypted == [ord(wave.f_to(x, z, start + n, dx)) for n, x in enumerate(codes)]
+
+    decrypted = wave.decrypt_codes(codes, z, dx, start).tolist()
+    expected = [outcome(lambda x, n: ord(wave.f_of(x, z, start + n, dx)), x, n) for n, x in enumerate(codes)]
+    # Векторная версия не вызывает chr(), поэтому сравниваются только допустимые коды
+    assert [code for code, ref in zip(decrypted, expected) if ref is not ValueError] == \
+        [ref for ref in expected if ref is not ValueError]
+
+
+@pytest.mark.parametrize('z, dx', random_keys(random.Random(2), 40))
+def test_encrypt_decrypt_match_scalar_functions(z, dx):
+    rng = random.Random(f'{z}:{dx}')
+    for high in (126, 255, 3000):
+        message = ''.join(chr(rng.randint(0, high)) for _ in range(rng.randint(0, 80)))
+        enc_message = wave.encrypt(message, z, dx)
+        assert enc_message == reference_encrypt(message, z, dx)
+        assert outcome(wave.decrypt, enc_message, z, dx) == outcome(reference_decrypt, enc_message, z, dx)
+
+
+def test_near_integer_values_use_scalar_result():
+    # При z = dx = 0 смещение ровно 255: все значения целые
+    codes = list(range(256))
+    assert wave.encrypt_codes(codes, 0, 0).tolist() == [ord(wave.f_to(x, 0, 0, 0)) for x in codes]
+    assert wave.decrypt_codes(codes, 0, 0).tolist() == [ord(wave.f_of(x, 0, 0, 0)) for x in codes]
+
+
+@pytest.mark.parametrize('direction', [-np.inf, np.inf])
+def test_last_bit_wave_difference_is_corrected(monkeypatch, direction):
+    # np.cos может отличаться от math.cos в последнем бите; имитируем это,
+    # сдвигая таблицу волны на одну ulp - округление должно остаться скалярным
+    original = wave.wave_vector
+    monkeypatch.setattr(wave, 'wave_vector',
+                        lambda *args: np.nextafter(original(*args), direction))
+    codes = list(range(256))
+    assert wave.encrypt_codes(codes, 0, 0).tolist() == [ord(wave.f_to(x, 0, 0, 0)) for x in codes]
+    assert wave.decrypt_codes(codes, 0, 0).tolist() == [ord(wave.f_of(x, 0, 0, 0)) for x in codes]
+
+
+@pytest.mark.parametrize('z, dx', random_keys(random.Random(3), 10))
+def test_bytes_round_trip(z, dx):
+    rng = random.Random(f'{z}:{dx}')
+    data = bytes(range(256)) + rng.randbytes(1 << 16)
+    start = rng.randint(0, 1000)
+    encrypted = wave.encrypt_bytes(data, z, dx, start=start)
+    assert bytes(wave.decrypt_bytes(encrypted, z, dx, start=start)) == data
+
+
+def test_byte_keystream_matches_scalar_formula():
+    z, dx = 1.5, 0.37
+    expected = [math.floor(255 * math.cos(z + n * dx)) % 256 for n in range(1000)]
+    assert wave.byte_keystream(z, dx, 1000).tolist() == expected
+
+
+def test_parallel_and_stream_match_single_call():
+    z, dx = 3, 7
+    data = random.Random(4).randbytes(10000)
+    encrypted = wave.encrypt_bytes(data, z, dx)
+    assert wave.encrypt_bytes_parallel(data, z, dx, workers=3, chunk_size=777) == encrypted
+    assert wave.decrypt_bytes_parallel(encrypted, z, dx, workers=3, chunk_size=777) == bytearray(data)
+    chunks = [data[pos:pos + 999] for pos in range(0, len(data), 999)]
+    assert b''.join(wave.iter_encrypt(chunks, z, dx)) == encrypted
+
+
+def test_file_round_trip(tmp_path):
+    data = bytes(range(256)) * 64 + random.Random(5).randbytes(5000)
+    src, enc, dec = tmp_path / 'src.bin', tmp_path / 'enc.bin', tmp_path / 'dec.bin'
+    src.write_bytes(data)
+    wave.encrypt_file(str(src), str(enc), 2.5, -0.7, block_size=1000, workers=2)
+    wave.decrypt_file(str(enc), str(dec), 2.5, -0.7, block_size=333)
+    assert dec.read_bytes() == data
+
+
+def test_cli_round_trip_in_place(tmp_path, capsys):
+    path = tmp_path / 'data.bin'
+    data = bytes(range(256)) * 4
+    path.write_bytes(data)
+    wave.main(['encrypt', str(path), '--in-place', '--z', '3', '--dx', '7'])
+    assert path.read_bytes() != data
+    wave.main(['decrypt', str(path), '--in-place', '--z', '3', '--dx', '7'])
+    assert path.read_bytes() == data
+
+
+def test_cli_requires_destination_or_in_place(tmp_path, capsys):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(b'\xff\x00')
+    with pytest.raises(SystemExit):
+        wave.main(['encrypt', str(path), '--z', '3', '--dx', '7'])
+    with pytest.raises(SystemExit):
+        wave.main(['encrypt', str(path), str(tmp_path / 'out.bin'), '--in-place', '--z', '3', '--dx', '7'])
+    assert path.read_bytes() == b'\xff\x00'